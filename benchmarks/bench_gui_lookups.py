@@ -0,0 +1,72 @@
+"""
+Benchmark: SAP GUI scripting calls per record with and without the screen map
+
+Runs create_material_gui and update_material_gui against a simulated SAP GUI
+session that counts findById and other COM calls, so it works on any
+platform without SAP GUI installed.
+"""
+
+import sys
+import os
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from material_master import MaterialMasterAutomation
+from fakes import FakeGuiSession
+from gui_wait import GuiWaiter
+
+
+SAMPLE_MATERIAL = {
+    'Material_Number': 'BENCH-001',
+    'Material_Type': 'FERT',
+    'Industry_Sector': 'M',
+    'Description': 'Benchmark material',
+    'Base_Unit': 'EA',
+    'Material_Group': '1000'
+}
+
+
+def run(automation: MaterialMasterAutomation, action: str, records: int, cache: bool) -> dict:
+    """Post records materials on a fresh session and return calls per record"""
+    automation.config.set('Automation', 'cache_gui_elements', str(cache))
+    session = FakeGuiSession(response_time=0.0)
+    post = automation.create_material_gui if action == 'create' else automation.update_material_gui
+
+    for _ in range(records):
+        success, message = post(SAMPLE_MATERIAL, session=session)
+        if not success:
+            raise RuntimeError(message)
+    return {
+        'find': session.find_calls / records,
+        'com': session.com_calls / records,
+        'round_trips': session.round_trips / records
+    }
+
+
+def main():
+    """Compare COM calls per record with and without element handle caching"""
+    parser = argparse.ArgumentParser(description='Benchmark SAP GUI element lookups')
+    parser.add_argument('--records', type=int, default=100, help='Records per action')
+    args = parser.parse_args()
+
+    automation = MaterialMasterAutomation()
+    automation.gui_waiter = GuiWaiter(poll_interval=0.0)
+    if not automation.config.has_section('Automation'):
+        automation.config.add_section('Automation')
+
+    print("\n" + "="*60)
+    print("GUI LOOKUP BENCHMARK (calls per record)")
+    print("="*60)
+    print(f"{'Action':<8}{'Cache':<7}{'findById':>10}{'COM calls':>11}{'Round-trips':>13}")
+    for action in ('create', 'update'):
+        for cache in (False, True):
+            calls = run(automation, action, args.records, cache)
+            print(f"{action:<8}{'on' if cache else 'off':<7}{calls['find']:>10.1f}"
+                  f"{calls['com']:>11.1f}{calls['round_trips']:>13.1f}")
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
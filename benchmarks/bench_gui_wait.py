@@ -0,0 +1,69 @@
+"""
+Benchmark: fixed GUI delays vs. the adaptive wait engine
+
+Runs create_material_gui against a simulated SAP GUI session, so it works on
+any platform without SAP GUI installed.
+"""
+
+import sys
+import os
+import time
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from material_master import MaterialMasterAutomation
+from fakes import FakeGuiSession
+from gui_wait import GuiWaiter
+
+
+SAMPLE_MATERIAL = {
+    'Material_Type': 'FERT',
+    'Industry_Sector': 'M',
+    'Description': 'Benchmark material',
+    'Base_Unit': 'EA',
+    'Material_Group': '1000'
+}
+
+
+def run(automation: MaterialMasterAutomation, waiter: GuiWaiter, records: int, response_time: float) -> float:
+    """Create records materials and return seconds per record"""
+    automation.gui_waiter = waiter
+    automation.sap_session = FakeGuiSession(response_time=response_time)
+
+    started = time.perf_counter()
+    for _ in range(records):
+        success, message = automation.create_material_gui(SAMPLE_MATERIAL)
+        if not success:
+            raise RuntimeError(message)
+    return (time.perf_counter() - started) / records
+
+
+def main():
+    """Compare per-record latency of fixed and adaptive waits"""
+    parser = argparse.ArgumentParser(description='Benchmark SAP GUI wait strategies')
+    parser.add_argument('--records', type=int, default=3, help='Records per strategy')
+    parser.add_argument('--delay', type=float, default=0.5, help='Fixed delay between actions')
+    parser.add_argument('--response-time', type=float, default=0.1,
+                        help='Simulated SAP response time per round-trip')
+    args = parser.parse_args()
+
+    automation = MaterialMasterAutomation()
+    fixed = run(automation, GuiWaiter(adaptive=False, fallback_delay=args.delay),
+                args.records, args.response_time)
+    adaptive = run(automation, GuiWaiter(fallback_delay=args.delay),
+                   args.records, args.response_time)
+
+    print("\n" + "="*60)
+    print("GUI WAIT BENCHMARK")
+    print("="*60)
+    print(f"Simulated response time: {args.response_time:.3f}s")
+    print(f"Fixed delay:    {fixed:.3f}s per record")
+    print(f"Adaptive wait:  {adaptive:.3f}s per record")
+    print(f"Speed-up:       {fixed / adaptive:.1f}x")
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
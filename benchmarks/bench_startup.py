@@ -0,0 +1,74 @@
+"""
+Benchmark: CLI startup time
+
+Times fresh interpreter runs of the command-line entry point, so import-time
+regressions (e.g. a heavy dependency imported at module level) show up.
+"""
+
+import sys
+import os
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
+SCRIPT = os.path.join(SRC_DIR, 'material_master.py')
+SAMPLE_FILE = os.path.join(PROJECT_ROOT, 'sample_data', 'material_master_template.csv')
+
+# Reports which heavy modules an import of material_master pulls in
+IMPORT_PROBE = (
+    "import sys; sys.path.insert(0, {src!r}); import material_master; "
+    "print(','.join(m for m in ('pandas', 'numpy', 'pyrfc', 'win32com') if m in sys.modules))"
+)
+
+
+def time_command(command, runs: int, cwd: str) -> float:
+    """Run command runs times and return the median wall time in seconds"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    """Time --help, a bare import and a tiny validate job"""
+    parser = argparse.ArgumentParser(description='Benchmark CLI startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command')
+    args = parser.parse_args()
+
+    # Run in a scratch directory so the validate job's logs do not pile up
+    with tempfile.TemporaryDirectory() as workdir:
+        probe = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE.format(src=SRC_DIR)],
+            cwd=workdir, capture_output=True, text=True
+        )
+        interpreter = time_command([sys.executable, '-c', 'pass'], args.runs, workdir)
+        help_time = time_command([sys.executable, SCRIPT, '--help'], args.runs, workdir)
+        import_time = time_command(
+            [sys.executable, '-c', f"import sys; sys.path.insert(0, {SRC_DIR!r}); import material_master"],
+            args.runs, workdir
+        )
+        validate_time = time_command(
+            [sys.executable, SCRIPT, SAMPLE_FILE, '--action', 'validate'],
+            args.runs, workdir
+        )
+
+    print("\n" + "="*60)
+    print("STARTUP BENCHMARK (median of {} runs)".format(args.runs))
+    print("="*60)
+    print(f"Bare interpreter:        {interpreter:.3f}s")
+    print(f"import material_master:  {import_time:.3f}s")
+    print(f"--help:                  {help_time:.3f}s")
+    print(f"validate (4 records):    {validate_time:.3f}s")
+    print(f"Heavy modules on import: {probe.stdout.strip() or 'none'}")
+    print("="*60)
+
+
+if __name__ == '__main__':
+    main()
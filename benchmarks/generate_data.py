@@ -0,0 +1,124 @@
+"""
+Synthetic material master data generator
+
+Produces input files in the layout of sample_data/material_master_template.csv
+with a configurable share of invalid records, for benchmarks and load tests.
+"""
+
+import sys
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from material_master import MaterialMasterAutomation
+
+
+COLUMNS = [
+    'Material_Number', 'Material_Type', 'Industry_Sector', 'Description', 'Base_Unit',
+    'Material_Group', 'Plant', 'Storage_Location', 'Valuation_Class', 'Price', 'Currency'
+]
+
+# Kinds of defects injected into invalid records, applied round-robin
+DEFECTS = [
+    'invalid_type',
+    'missing_field',
+    'invalid_sector',
+    'long_base_unit',
+    'negative_price',
+    'invalid_price'
+]
+
+
+def generate_materials(rows: int, invalid_ratio: float = 0.1, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate material master records
+
+    Args:
+        rows: Number of records
+        invalid_ratio: Share of records with exactly one validation defect
+        seed: Random seed, for reproducible files
+
+    Returns:
+        DataFrame with one column per input field, all values as strings
+    """
+    rng = np.random.default_rng(seed)
+    material_types = rng.choice(MaterialMasterAutomation.VALID_MATERIAL_TYPES, rows)
+    numbers = pd.Series(np.arange(1, rows + 1)).astype(str).str.zfill(7)
+
+    df = pd.DataFrame({
+        'Material_Number': '',
+        'Material_Type': material_types,
+        'Industry_Sector': rng.choice(MaterialMasterAutomation.VALID_INDUSTRY_SECTORS, rows),
+        'Description': 'Material ' + pd.Series(material_types) + ' ' + numbers,
+        'Base_Unit': rng.choice(['EA', 'KG', 'PC', 'L', 'M', 'BOX'], rows),
+        'Material_Group': rng.choice(['1000', '1500', '2000', '3000'], rows),
+        'Plant': rng.choice(['1000', '2000'], rows),
+        'Storage_Location': rng.choice(['0001', '0002', '0010'], rows),
+        'Valuation_Class': rng.choice(['3000', '3100', '3200'], rows),
+        'Price': np.char.mod('%.2f', rng.uniform(0.5, 5000.0, rows)),
+        'Currency': rng.choice(['USD', 'EUR'], rows)
+    }, columns=COLUMNS)
+
+    invalid = rng.choice(rows, size=int(rows * invalid_ratio), replace=False)
+    for number, defect in enumerate(DEFECTS):
+        targets = invalid[number::len(DEFECTS)]
+        if defect == 'invalid_type':
+            df.loc[targets, 'Material_Type'] = 'XXXX'
+        elif defect == 'missing_field':
+            fields = rng.choice(MaterialMasterAutomation.MANDATORY_FIELDS, len(targets))
+            for field in MaterialMasterAutomation.MANDATORY_FIELDS:
+                df.loc[targets[fields == field], field] = ''
+        elif defect == 'invalid_sector':
+            df.loc[targets, 'Industry_Sector'] = 'X'
+        elif defect == 'long_base_unit':
+            df.loc[targets, 'Base_Unit'] = 'EACH'
+        elif defect == 'negative_price':
+            df.loc[targets, 'Price'] = '-10.00'
+        else:  # invalid_price
+            df.loc[targets, 'Price'] = 'unknown'
+
+    return df
+
+
+def write_materials(df: pd.DataFrame, output_file: str):
+    """
+    Write generated records to CSV, Excel or Parquet
+
+    Args:
+        df: Generated records
+        output_file: Path ending in .csv, .xlsx or .parquet
+    """
+    if output_file.endswith('.csv'):
+        df.to_csv(output_file, index=False)
+    elif output_file.endswith('.xlsx'):
+        df.to_excel(output_file, index=False)
+    elif output_file.endswith('.parquet'):
+        # Parquet columns have one type; mixed columns (e.g. invalid prices) become strings
+        mixed = [column for column in df.columns if df[column].dtype == object]
+        df.astype({column: 'string' for column in mixed}).to_parquet(output_file, index=False)
+    else:
+        raise ValueError(f"Unsupported file format: {output_file}")
+
+
+def main():
+    """Generate a synthetic input file"""
+    parser = argparse.ArgumentParser(description='Generate synthetic material master data')
+    parser.add_argument('output_file', help='Path of the .csv, .xlsx or .parquet file to write')
+    parser.add_argument('--rows', type=int, default=1000, help='Number of records')
+    parser.add_argument('--invalid-ratio', type=float, default=0.1,
+                        help='Share of records with a validation defect')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    df = generate_materials(args.rows, args.invalid_ratio, args.seed)
+    write_materials(df, args.output_file)
+    print(f"Wrote {len(df)} records to {args.output_file}")
+
+
+if __name__ == '__main__':
+    main()
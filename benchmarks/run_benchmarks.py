@@ -0,0 +1,166 @@
+"""
+Benchmark harness for material processing throughput
+
+Generates synthetic inputs and measures reading, validation and processing
+runs against fake RFC and GUI backends. Each scenario runs in a fresh
+process so peak RSS is reported per scenario.
+"""
+
+import sys
+import os
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+# Add src and benchmarks to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from generate_data import generate_materials, write_materials
+
+
+SCENARIOS = ['read', 'validate', 'rfc', 'gui']
+
+CONFIG = """[Automation]
+delay_between_actions = 0
+chunk_size = {chunksize}
+journal_file =
+results_include_data = False
+
+[Logging]
+log_level = ERROR
+log_file = {workdir}/logs/benchmark.log
+"""
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, if the platform reports it"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(stages: Dict, name: str, func):
+    """Wrap func so its cumulative run time is added to stages[name]"""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stages[name] = stages.get(name, 0.0) + time.perf_counter() - started
+    return wrapper
+
+
+def run_scenario(scenario: str, input_file: str, workdir: str, chunksize: int) -> Dict:
+    """
+    Run one scenario in the current process
+
+    Args:
+        scenario: One of SCENARIOS
+        input_file: Input CSV, Excel or Parquet file
+        workdir: Scratch directory for config, logs and results
+        chunksize: Records per chunk (0 = whole file)
+
+    Returns:
+        Dictionary with records, seconds, per-stage seconds and peak RSS
+    """
+    from material_master import MaterialMasterAutomation
+    from fakes import FakeRFCConnection, FakeScriptingEngine
+    from results_writer import ResultsWriter
+
+    os.chdir(workdir)
+    config_file = os.path.join(workdir, 'benchmark.ini')
+    with open(config_file, 'w') as f:
+        f.write(CONFIG.format(chunksize=chunksize, workdir=workdir))
+
+    engine = FakeScriptingEngine(response_time=0.0)
+    automation = MaterialMasterAutomation(
+        config_file=config_file,
+        rfc_connection_factory=lambda **params: FakeRFCConnection(),
+        gui_engine_factory=lambda: engine
+    )
+
+    stages = {}
+    automation.validate_dataframe = timed(stages, 'validate', automation.validate_dataframe)
+    automation._post_material = timed(stages, 'post', automation._post_material)
+    ResultsWriter.write = timed(stages, 'results', ResultsWriter.write)
+
+    started = time.perf_counter()
+    if scenario == 'read':
+        records = len(automation.read_input_file(input_file))
+    else:
+        action = 'validate' if scenario == 'validate' else 'create'
+        summary = automation.process_materials(
+            input_file, method=scenario if scenario != 'validate' else 'rfc',
+            action=action, keep_results=False
+        )
+        records = summary['total']
+    elapsed = time.perf_counter() - started
+    automation.disconnect()
+
+    # Chunks are read lazily inside the run, so reading is part of the rest
+    if scenario != 'read':
+        stages['read+other'] = elapsed - sum(stages.values())
+
+    return {
+        'records': records,
+        'seconds': elapsed,
+        'stages': stages,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def main():
+    """Generate inputs and report throughput per scenario and size"""
+    parser = argparse.ArgumentParser(description='Benchmark material processing throughput')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000],
+                        help='Input sizes to benchmark, e.g. 1000 100000 1000000')
+    parser.add_argument('--invalid-ratio', type=float, default=0.1,
+                        help='Share of generated records with a validation defect')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS,
+                        help='Scenarios to run')
+    parser.add_argument('--format', choices=['csv', 'xlsx', 'parquet'], default='csv',
+                        help='Generated input file format')
+    parser.add_argument('--chunksize', type=int, default=0,
+                        help='Records per chunk (0 = whole file)')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+
+    print("="*78)
+    print(f"{'Scenario':<10}{'Rows':>10}{'Seconds':>10}{'Rows/s':>12}{'Peak RSS':>11}  Stages")
+    print("="*78)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            input_file = os.path.join(workdir, f'materials_{rows}.{args.format}')
+            write_materials(generate_materials(rows, args.invalid_ratio), input_file)
+
+            for scenario in args.scenarios:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(
+                        run_scenario, scenario, input_file, workdir, args.chunksize
+                    ).result()
+
+                rate = result['records'] / result['seconds'] if result['seconds'] else 0.0
+                rss = result['peak_rss_mb']
+                stages = ', '.join(
+                    f"{name} {seconds:.2f}s" for name, seconds in sorted(result['stages'].items())
+                )
+                print(
+                    f"{scenario:<10}{result['records']:>10}{result['seconds']:>10.2f}"
+                    f"{rate:>12.0f}{(f'{rss:.0f} MB' if rss else 'n/a'):>11}  {stages}"
+                )
+
+    print("="*78)
+
+
+if __name__ == '__main__':
+    main()
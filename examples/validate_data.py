@@ -9,7 +9,6 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from material_master import MaterialMasterAutomation
-import pandas as pd
 
 
 def main():
@@ -39,14 +38,14 @@ def main():
         valid_count = 0
         invalid_count = 0
         
-        # Validate each record
-        for idx, row in df.iterrows():
-            material_data = row.to_dict()
+        # Validate all records at once, then report each record
+        _, validation_errors = automation.validate_dataframe(df, action='validate')
+        
+        for idx, material_data in zip(df.index, df.to_dict('records')):
             record_num = idx + 1
+            errors = validation_errors.get(idx, [])
             
-            is_valid, errors = automation.validate_material_data(material_data)
-            
-            if is_valid:
+            if not errors:
                 print(f"✓ Record {record_num}: VALID")
                 print(f"  Description: {material_data.get('Description', 'N/A')}")
                 print(f"  Type: {material_data.get('Material_Type', 'N/A')}")
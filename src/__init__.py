@@ -4,6 +4,8 @@ SAP Material Master Automation Tool
 
 __version__ = '1.0.0'
 __author__ = 'Harshini Karan'
-__all__ = ['MaterialMasterAutomation']
+__all__ = ['MaterialMasterAutomation', 'GuiWaiter', 'RFCConnectionPool']
 
 from .material_master import MaterialMasterAutomation
+from .gui_wait import GuiWaiter
+from .rfc_pool import RFCConnectionPool
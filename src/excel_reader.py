@@ -0,0 +1,111 @@
+"""
+Streaming reader for large .xlsx files using openpyxl's read-only mode
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def map_headers(headers: List, column_map: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Turn header cells into column names
+
+    Args:
+        headers: Header cell values
+        column_map: Input header (lower case) to column name
+
+    Returns:
+        Column names, 'Unnamed: <n>' for empty header cells as in pandas
+    """
+    column_map = column_map or {}
+    names = []
+    for position, header in enumerate(headers):
+        if header is None or not str(header).strip():
+            names.append(f"Unnamed: {position}")
+        else:
+            name = str(header).strip()
+            names.append(column_map.get(name.lower(), name))
+    return names
+
+
+def iter_excel(
+    file_path: str,
+    chunksize: int,
+    sheet: Union[str, int, None] = None,
+    header_row: int = 1,
+    column_map: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream the rows of one worksheet in DataFrames of at most chunksize rows
+
+    The workbook is opened and the header read immediately, so a missing
+    file, sheet or header raises here. Blank rows between records are kept
+    (as pandas.read_excel does) so record numbers match; trailing blank rows
+    are dropped.
+
+    Args:
+        file_path: Path to the .xlsx file
+        chunksize: Maximum number of rows per DataFrame
+        sheet: Worksheet name or 0-based index (default: first sheet)
+        header_row: 1-based row holding the column headers
+        column_map: Input header (lower case) to column name
+
+    Returns:
+        Iterator of DataFrames with a continuous index across the sheet
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet is None or isinstance(sheet, int):
+            worksheet = workbook.worksheets[sheet or 0]
+        else:
+            worksheet = workbook[sheet]
+
+        rows = worksheet.iter_rows(min_row=header_row, values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError(f"No header row {header_row} in sheet {worksheet.title}")
+    except Exception:
+        workbook.close()
+        raise
+
+    columns = map_headers(header, column_map)
+    return _frames(workbook, rows, columns, chunksize)
+
+
+def _frames(workbook, rows, columns: List[str], chunksize: int) -> Iterator[pd.DataFrame]:
+    width = len(columns)
+    chunk = []
+    blank = 0
+    start = 0
+    try:
+        for row in rows:
+            if all(value is None for value in row):
+                blank += 1
+                continue
+            # Blank rows count only when a record follows them
+            chunk.extend([(None,) * width] * blank)
+            blank = 0
+            chunk.append(tuple(row[:width]) + (None,) * (width - len(row)))
+
+            while len(chunk) >= chunksize:
+                yield _frame(chunk[:chunksize], columns, start)
+                start += chunksize
+                chunk = chunk[chunksize:]
+        if chunk:
+            yield _frame(chunk, columns, start)
+    finally:
+        workbook.close()
+
+
+def _frame(rows: List[tuple], columns: List[str], start: int) -> pd.DataFrame:
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df.infer_objects()
@@ -0,0 +1,74 @@
+"""
+Time-limited cache of material numbers known to exist (or not) in SAP
+"""
+
+import threading
+import time
+from typing import Iterable, List, Set, Tuple
+
+
+class MaterialExistenceCache:
+    """Remember existence lookups so re-runs do not read the same numbers again"""
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        Create an empty cache
+
+        Args:
+            ttl: Seconds a lookup stays valid (0 disables caching)
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, numbers: Iterable[str]) -> Tuple[Set[str], List[str]]:
+        """
+        Split material numbers into known existing ones and ones to look up
+
+        Args:
+            numbers: Material numbers in SAP internal format
+
+        Returns:
+            Tuple of (existing, unknown): numbers cached as existing, and
+            numbers without a valid cache entry, in first-seen order
+        """
+        now = time.monotonic()
+        existing = set()
+        unknown = []
+        with self._lock:
+            for number in dict.fromkeys(numbers):
+                entry = self._entries.get(number)
+                if entry and now - entry[1] < self.ttl:
+                    self.hits += 1
+                    if entry[0]:
+                        existing.add(number)
+                else:
+                    self.misses += 1
+                    unknown.append(number)
+        return existing, unknown
+
+    def store(self, numbers: Iterable[str], existing: Set[str]):
+        """
+        Record the result of an existence lookup
+
+        Args:
+            numbers: Material numbers that were looked up
+            existing: Those of them that exist in SAP
+        """
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for number in numbers:
+                self._entries[number] = (number in existing, now)
+
+    def add(self, number: str):
+        """Mark a material as existing, e.g. after it was created"""
+        self.store([number], {number})
+
+    def clear(self):
+        """Forget all lookups"""
+        with self._lock:
+            self._entries.clear()
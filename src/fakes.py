@@ -0,0 +1,380 @@
+"""
+Local stand-ins for SAP interfaces
+
+These objects mimic the parts of pyrfc and SAP GUI scripting that the tool
+uses, so processing runs can be exercised and timed without an SAP system.
+"""
+
+import itertools
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class CommunicationError(Exception):
+    """Stand-in for pyrfc.CommunicationError (SAP system not reachable)"""
+
+    key = 'RFC_COMMUNICATION_FAILURE'
+
+
+class FakeRFCConnection:
+    """Stand-in for pyrfc.Connection that answers BAPI calls locally"""
+
+    _numbers = itertools.count(100000)
+    _numbers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        fail_materials: Optional[Iterable[str]] = None,
+        table: Optional[Dict[str, Dict]] = None,
+        outage_calls: int = 0,
+        drop_after: Optional[int] = None,
+        **params
+    ):
+        """
+        Create a fake connection
+
+        Args:
+            latency: Seconds each call blocks, simulating the network round-trip
+            fail_materials: Descriptions that SAP should reject
+            table: Material master (MARA) rows by internal material number;
+                pass the same dict to several connections to share it
+            outage_calls: Number of first calls that fail with a
+                CommunicationError, simulating a short outage
+            drop_after: Number of calls after which the connection is
+                dropped, failing every later call with a CommunicationError
+            params: Connection parameters (accepted and ignored)
+        """
+        self.latency = latency
+        self.fail_materials = set(fail_materials or [])
+        self.table = table if table is not None else {}
+        self.outage_calls = outage_calls
+        self.drop_after = drop_after
+        self.params = params
+        self.calls: List[Dict] = []
+        self.closed = False
+
+    def call(self, func_name: str, **kwargs) -> Dict:
+        """
+        Simulate a remote function call
+
+        Args:
+            func_name: Name of the remote function
+            kwargs: Function parameters
+
+        Returns:
+            Result dictionary in the shape pyrfc returns
+        """
+        if self.closed:
+            raise RuntimeError("Connection is closed")
+
+        self.calls.append({'function': func_name, 'parameters': kwargs})
+        if self.latency:
+            time.sleep(self.latency)
+        if len(self.calls) <= self.outage_calls:
+            raise CommunicationError(f"Connection to SAP lost during {func_name}")
+        if self.drop_after is not None and len(self.calls) > self.drop_after:
+            raise CommunicationError("Connection to SAP was closed by the gateway")
+
+        if func_name == 'BAPI_MATERIAL_SAVEDATA':
+            return self._save_data(**kwargs)
+        if func_name == 'BAPI_MATERIAL_SAVEREPLICA':
+            return self._save_replica(**kwargs)
+        if func_name == 'BAPI_MATERIAL_GETINTNUMBER':
+            return self._get_int_number(**kwargs)
+        if func_name == 'RFC_READ_TABLE':
+            return self._read_table(**kwargs)
+        if func_name == 'BAPI_MATERIAL_GET_DETAIL':
+            return self._get_detail(**kwargs)
+        return {'RETURN': {'TYPE': 'S', 'MESSAGE': ''}}
+
+    @staticmethod
+    def _internal_number(number) -> str:
+        if isinstance(number, float) and number.is_integer():
+            number = int(number)
+        number = str(number).strip()
+        return number.zfill(18) if number.isdigit() else number.upper()
+
+    def _store(self, number: str, *structures: Optional[Dict]):
+        # Merge the given (partial) structures into the material's row
+        row = self.table.setdefault(self._internal_number(number), {})
+        for structure in structures:
+            row.update((key, value) for key, value in (structure or {}).items()
+                       if key not in ('FUNCTION', 'MATERIAL', 'LANGU') and value is not None)
+        row['MATERIAL'] = number
+
+    def _get_detail(self, MATERIAL='', **kwargs) -> Dict:
+        row = self.table.get(self._internal_number(MATERIAL))
+        if row is None:
+            return {'RETURN': {'TYPE': 'E', 'MESSAGE': f"Material {MATERIAL} does not exist"}}
+        return {
+            'RETURN': {'TYPE': 'S', 'MESSAGE': ''},
+            'MATERIAL_GENERAL_DATA': {
+                field: row.get(field, '') for field in ('MATL_TYPE', 'IND_SECTOR', 'BASE_UOM', 'MATL_DESC')
+            }
+        }
+
+    def _read_table(self, QUERY_TABLE='', OPTIONS=(), **kwargs) -> Dict:
+        # Only MARA lookups by MATNR literals are supported
+        where = ''.join(option['TEXT'] for option in OPTIONS)
+        numbers = re.findall(r"'([^']*)'", where)
+        return {
+            'FIELDS': [{'FIELDNAME': 'MATNR'}],
+            'DATA': [{'WA': number} for number in numbers if number in self.table]
+        }
+
+    def _next_number(self) -> str:
+        with self._numbers_lock:
+            return str(next(self._numbers))
+
+    def _get_int_number(self, REQUIRED_NUMBERS=1, **kwargs) -> Dict:
+        return {
+            'RETURN': {'TYPE': 'S', 'MESSAGE': ''},
+            'MATERIAL_NUMBER': [{'MATERIAL': self._next_number()} for _ in range(REQUIRED_NUMBERS)]
+        }
+
+    def _save_replica(self, HEADDATA=(), CLIENTDATA=(), MATERIALDESCRIPTION=(), **kwargs) -> Dict:
+        descriptions = {row['MATERIAL']: row.get('MATL_DESC', '') for row in MATERIALDESCRIPTION}
+        clients = {row['MATERIAL']: row for row in CLIENTDATA}
+        description_rows = {row['MATERIAL']: row for row in MATERIALDESCRIPTION}
+        messages = []
+        for row, head in enumerate(HEADDATA, start=1):
+            material = head['MATERIAL']
+            if descriptions.get(material) in self.fail_materials:
+                messages.append({'TYPE': 'E', 'MATERIAL': material, 'ROW': row,
+                                 'MESSAGE': f"Material {descriptions[material]} rejected"})
+            else:
+                self._store(material, head, clients.get(material), description_rows.get(material))
+                messages.append({'TYPE': 'S', 'MATERIAL': material, 'ROW': row,
+                                 'MESSAGE': f"Material {material} saved"})
+        failed = any(message['TYPE'] == 'E' for message in messages)
+        return {
+            'RETURN': {'TYPE': 'E' if failed else 'S', 'MESSAGE': ''},
+            'RETURNMESSAGES': messages
+        }
+
+    def _save_data(self, HEADDATA=None, CLIENTDATA=None, MATERIALDESCRIPTION=None, **kwargs) -> Dict:
+        description = (MATERIALDESCRIPTION or {}).get('MATL_DESC', '')
+        if description in self.fail_materials:
+            return {'RETURN': {'TYPE': 'E', 'MESSAGE': f"Material {description} rejected"}}
+
+        number = (HEADDATA or {}).get('MATERIAL')
+        if not number or number != number:  # empty or NaN
+            number = self._next_number()
+        self._store(number, HEADDATA, CLIENTDATA, MATERIALDESCRIPTION)
+        return {
+            'RETURN': {'TYPE': 'S', 'MESSAGE': f"Material {number} saved"},
+            'NUMBER': number
+        }
+
+    def close(self):
+        """Close the connection"""
+        self.closed = True
+
+
+class FakeGuiElement:
+    """Stand-in for an SAP GUI scripting element (field or window)"""
+
+    def __init__(self, session: 'FakeGuiSession', element_id: str, screen: Optional[int] = None):
+        """
+        Create an element
+
+        Args:
+            session: Session the element belongs to
+            element_id: Scripting ID of the element
+            screen: Screen instance the element is part of; using it after
+                the screen was replaced raises (None = lives as long as
+                the session, like the main window)
+        """
+        self.session = session
+        self.id = element_id
+        self.screen = screen
+        self._text = ''
+
+    def _check(self):
+        self.session.com_calls += 1
+        if self.screen is not None and self.screen != self.session._screen:
+            raise RuntimeError(f"The control could not be found by id: {self.id}")
+
+    @property
+    def text(self) -> str:
+        self._check()
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        self._check()
+        self._text = value
+
+    def sendVKey(self, key: int):
+        """Simulate pressing a virtual key (0 = Enter, 11 = Ctrl+S)"""
+        self._check()
+        self.session._round_trip(save=key == 11)
+
+
+class FakeStatusBar:
+    """Stand-in for the status bar, empty until the session is ready"""
+
+    def __init__(self, session: 'FakeGuiSession'):
+        self.session = session
+        self.id = 'wnd[0]/sbar'
+
+    @property
+    def text(self) -> str:
+        self.session.com_calls += 1
+        if self.session._busy_until > time.perf_counter():
+            return ''
+        return self.session._status
+
+
+class FakeGuiSession:
+    """
+    Stand-in for an SAP GUI scripting session with simulated response time
+
+    Like SAP GUI, every round-trip replaces the screen: handles of its
+    elements become invalid, while the main window and status bar stay.
+    """
+
+    _numbers = itertools.count(200000)
+    _numbers_lock = threading.Lock()
+
+    def __init__(
+        self,
+        response_time: float = 0.1,
+        busy_observable: bool = True,
+        connection: Optional['FakeGuiConnection'] = None
+    ):
+        """
+        Create a fake session
+
+        Args:
+            response_time: Seconds the session stays busy after each round-trip
+            busy_observable: If False, reading Busy raises like an older
+                SAP GUI that cannot be polled
+            connection: Connection the session belongs to
+        """
+        self.response_time = response_time
+        self.busy_observable = busy_observable
+        self.connection = connection
+        self.transaction = None
+        # Cross-process calls made by the client: findById calls alone and
+        # all calls including properties, keys and transactions
+        self.find_calls = 0
+        self.com_calls = 0
+        self.round_trips = 0
+        self._screen = 0
+        self._window = FakeGuiElement(self, 'wnd[0]')
+        self._status_bar = FakeStatusBar(self)
+        self._elements: Dict[str, FakeGuiElement] = {}
+        self._material = ''
+        self._busy_until = 0.0
+        self._status = ''
+
+    @property
+    def Busy(self) -> bool:
+        self.com_calls += 1
+        if not self.busy_observable:
+            raise AttributeError('Busy')
+        return self._busy_until > time.perf_counter()
+
+    def StartTransaction(self, transaction: str):
+        """Simulate starting a transaction"""
+        self.com_calls += 1
+        self.transaction = transaction
+        self._material = ''
+        self._round_trip()
+
+    def CreateSession(self):
+        """Open another session on the same connection"""
+        self.com_calls += 1
+        if self.connection is None:
+            raise RuntimeError("Session is not attached to a connection")
+        self.connection.open_session()
+
+    def findById(self, element_id: str):
+        """Resolve an element by its scripting ID"""
+        self.find_calls += 1
+        self.com_calls += 1
+        if element_id == 'wnd[0]':
+            return self._window
+        if element_id == 'wnd[0]/sbar':
+            return self._status_bar
+        if element_id not in self._elements:
+            self._elements[element_id] = FakeGuiElement(self, element_id, self._screen)
+        return self._elements[element_id]
+
+    def _round_trip(self, save: bool = False):
+        self.round_trips += 1
+        number = self._elements.get('wnd[0]/usr/ctxtRMMG1-MATNR')
+        if number is not None:
+            self._material = number._text
+        self._screen += 1
+        self._elements = {}
+        self._busy_until = time.perf_counter() + self.response_time
+        if not save:
+            self._status = ''
+        elif self.transaction == 'MM02':
+            self._status = f"Material {self._material} changed"
+        else:
+            with self._numbers_lock:
+                self._status = f"Material {next(self._numbers)} created"
+
+
+class FakeGuiCollection(list):
+    """Stand-in for a GuiComponentCollection (callable by index, with Count)"""
+
+    def __call__(self, index: int):
+        return self[index]
+
+    def Item(self, index: int):
+        return self[index]
+
+    @property
+    def Count(self) -> int:
+        return len(self)
+
+
+class FakeGuiConnection:
+    """Stand-in for an SAP GUI connection holding sessions"""
+
+    def __init__(self, response_time: float = 0.1, sessions: int = 1, max_sessions: int = 6):
+        """
+        Create a fake connection
+
+        Args:
+            response_time: Response time of every session on this connection
+            sessions: Number of sessions open initially
+            max_sessions: Session limit, like SAP's per-user limit
+        """
+        self.response_time = response_time
+        self.max_sessions = max_sessions
+        self.Children = FakeGuiCollection()
+        for _ in range(sessions):
+            self.open_session()
+
+    def open_session(self) -> FakeGuiSession:
+        """Open a new session"""
+        if len(self.Children) >= self.max_sessions:
+            raise RuntimeError(f"Maximum number of {self.max_sessions} sessions reached")
+        session = FakeGuiSession(self.response_time, connection=self)
+        self.Children.append(session)
+        return session
+
+
+class FakeScriptingEngine:
+    """Stand-in for the SAP GUI scripting engine (GuiApplication)"""
+
+    def __init__(self, response_time: float = 0.1, sessions: int = 1, max_sessions: int = 6):
+        """
+        Create a fake scripting engine with one logged-on connection
+
+        Args:
+            response_time: Response time of every session
+            sessions: Number of sessions open initially
+            max_sessions: Session limit per connection
+        """
+        self.Children = FakeGuiCollection([
+            FakeGuiConnection(response_time, sessions, max_sessions)
+        ])
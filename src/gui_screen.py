@@ -0,0 +1,92 @@
+"""
+Screen map caching SAP GUI element handles between scripting calls
+"""
+
+from typing import Any, Callable, Dict
+
+
+class ScreenMap:
+    """Resolve SAP GUI elements of one session through a handle cache"""
+
+    # Elements that live as long as the session: the main window and its
+    # status bar are kept across round-trips and transactions
+    SESSION_ELEMENTS = ('wnd[0]', 'wnd[0]/sbar')
+
+    def __init__(self, session: Any, enabled: bool = True):
+        """
+        Create an empty map
+
+        Args:
+            session: SAP GUI scripting session
+            enabled: Cache handles; if False, every lookup calls findById
+        """
+        self.session = session
+        self.enabled = enabled
+        self.lookups = 0
+        self.hits = 0
+        self._session_elements: Dict[str, Any] = {}
+        self._screen_elements: Dict[str, Any] = {}
+
+    def find(self, element_id: str) -> Any:
+        """
+        Get an element, calling findById only if the current screen
+        instance has not resolved it yet
+
+        Args:
+            element_id: Scripting ID, e.g. 'wnd[0]/usr/ctxtRMMG1-MTART'
+
+        Returns:
+            Element handle
+        """
+        self.lookups += 1
+        if not self.enabled:
+            return self.session.findById(element_id)
+        cache = self._session_elements if element_id in self.SESSION_ELEMENTS else self._screen_elements
+        element = cache.get(element_id)
+        if element is None:
+            element = cache[element_id] = self.session.findById(element_id)
+        else:
+            self.hits += 1
+        return element
+
+    def set_text(self, element_id: str, value: Any):
+        """Set the text of a field"""
+        self.find(element_id).text = value
+
+    def start_transaction(self, transaction: str):
+        """Start a transaction, which replaces the screen"""
+        self.screen_changed()
+        self.session.StartTransaction(transaction)
+
+    def send_vkey(self, key: int, window: str = 'wnd[0]'):
+        """
+        Press a virtual key in a window, which sends the screen to SAP and
+        replaces it with the response
+
+        Args:
+            key: Virtual key (0 = Enter, 11 = Ctrl+S)
+            window: Window receiving the key
+        """
+        self.screen_changed()
+        self._session_call(window, lambda element: element.sendVKey(key))
+
+    def status_text(self) -> str:
+        """Text of the main window's status bar"""
+        return self._session_call('wnd[0]/sbar', lambda element: element.text)
+
+    def screen_changed(self):
+        """Forget the handles of the current screen instance"""
+        self._screen_elements = {}
+
+    def _session_call(self, element_id: str, action: Callable[[Any], Any]) -> Any:
+        # A cached session element that became invalid anyway (e.g. the
+        # window was closed and reopened) is resolved again once; failures
+        # of a freshly resolved element are real errors
+        cached = self.enabled and element_id in self._session_elements
+        try:
+            return action(self.find(element_id))
+        except Exception:
+            if not cached:
+                raise
+            del self._session_elements[element_id]
+            return action(self.find(element_id))
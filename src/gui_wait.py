@@ -0,0 +1,86 @@
+"""
+Adaptive wait engine for SAP GUI scripting sessions
+"""
+
+import time
+from typing import Any, Callable, Optional
+
+
+class GuiWaiter:
+    """Wait for an SAP GUI session to become ready instead of sleeping a fixed delay"""
+
+    def __init__(
+        self,
+        adaptive: bool = True,
+        fallback_delay: float = 0.5,
+        timeout: float = 10.0,
+        poll_interval: float = 0.02,
+        max_poll_interval: float = 0.25,
+        on_wait: Optional[Callable[[float], None]] = None
+    ):
+        """
+        Configure the waiter
+
+        Args:
+            adaptive: Poll the session; if False, always sleep the fallback delay
+            fallback_delay: Fixed delay used when the session cannot be polled
+            timeout: Maximum seconds to wait for the session to become ready
+            poll_interval: Initial seconds between polls
+            max_poll_interval: Upper bound for the poll interval as it backs off
+            on_wait: Called with the seconds spent after each completed wait
+        """
+        self.adaptive = adaptive
+        self.fallback_delay = fallback_delay
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.on_wait = on_wait
+
+    def wait(self, session: Any, factor: float = 1.0) -> float:
+        """
+        Block until the session is no longer busy
+
+        Polls session.Busy with exponential backoff, bounded by the timeout.
+        If polling is disabled or the session does not expose a busy state,
+        sleeps the fallback delay multiplied by factor instead.
+
+        Args:
+            session: SAP GUI scripting session
+            factor: Multiplier for the fallback delay
+
+        Returns:
+            Seconds spent waiting
+        """
+        seconds = self._wait(session, factor)
+        if self.on_wait:
+            self.on_wait(seconds)
+        return seconds
+
+    def _wait(self, session: Any, factor: float) -> float:
+        started = time.perf_counter()
+        if not self.adaptive:
+            return self._sleep_fallback(started, factor)
+
+        deadline = started + self.timeout
+        interval = self.poll_interval
+
+        while True:
+            try:
+                busy = session.Busy
+            except Exception:
+                # Session cannot be polled (e.g. older SAP GUI); fall back
+                return self._sleep_fallback(started, factor)
+
+            if not busy:
+                return time.perf_counter() - started
+
+            now = time.perf_counter()
+            if now >= deadline:
+                raise TimeoutError(f"SAP GUI session still busy after {self.timeout:.1f}s")
+
+            time.sleep(min(interval, deadline - now))
+            interval = min(interval * 2, self.max_poll_interval)
+
+    def _sleep_fallback(self, started: float, factor: float) -> float:
+        time.sleep(self.fallback_delay * factor)
+        return time.perf_counter() - started
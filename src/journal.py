@@ -0,0 +1,107 @@
+"""
+Checkpoint journal for resuming interrupted processing runs
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Set
+
+
+class RunJournal:
+    """Append-only SQLite journal of record outcomes per input file and action"""
+
+    def __init__(self, journal_file: str, file_hash: str, action: str):
+        """
+        Open (or create) the journal
+
+        Args:
+            journal_file: Path to the SQLite journal file
+            file_hash: Hash identifying the input file contents
+            action: 'create', 'update', or 'validate'
+        """
+        directory = os.path.dirname(journal_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.file_hash = file_hash
+        self.action = action
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(journal_file, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS outcomes ('
+            ' file_hash TEXT NOT NULL,'
+            ' action TEXT NOT NULL,'
+            ' record INTEGER NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' message TEXT,'
+            ' completed_at TEXT NOT NULL)'
+        )
+        self._db.execute(
+            'CREATE INDEX IF NOT EXISTS outcomes_run ON outcomes (file_hash, action, status)'
+        )
+        self._db.commit()
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """
+        Hash the contents of a file
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def record(self, record_num: int, success: bool, message: str):
+        """
+        Append the outcome of one record
+
+        Args:
+            record_num: 1-based record number in the input file
+            success: Whether the record was processed successfully
+            message: Result message
+        """
+        with self._lock:
+            self._db.execute(
+                'INSERT INTO outcomes VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    self.file_hash,
+                    self.action,
+                    int(record_num),
+                    'success' if success else 'failed',
+                    message,
+                    datetime.now().isoformat()
+                )
+            )
+            self._db.commit()
+
+    def committed_records(self) -> Set[int]:
+        """
+        Get the records that already succeeded for this file and action
+
+        Returns:
+            Set of 1-based record numbers
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT DISTINCT record FROM outcomes"
+                " WHERE file_hash = ? AND action = ? AND status = 'success'",
+                (self.file_hash, self.action)
+            )
+            return {row[0] for row in rows}
+
+    def close(self):
+        """Close the journal"""
+        with self._lock:
+            self._db.close()
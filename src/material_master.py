@@ -1,32 +1,112 @@
 """
 SAP Material Master Automation Tool
 Main module for automating material master creation, update, and validation
+
+Heavy and platform-specific dependencies (pandas, pyrfc, win32com) are
+imported on first use, so importing this module and running --help stay fast.
 """
 
+from __future__ import annotations
+
 import os
 import sys
-import time
+import asyncio
 import logging
 import configparser
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
-# Try to import SAP GUI scripting (Windows only)
 try:
-    import win32com.client
-    SAP_GUI_AVAILABLE = True
+    from .excel_reader import iter_excel, map_headers
+    from .existence_cache import MaterialExistenceCache
+    from .gui_screen import ScreenMap
+    from .gui_wait import GuiWaiter
+    from .journal import RunJournal
+    from .metrics import StageMetrics, timed
+    from .profiling import RunProfiler
+    from .results_writer import ResultsWriter
+    from .retry_policy import CircuitBreaker, RetryPolicy, is_transient
+    from .rfc_connection import ReconnectingConnection
+    from .rfc_pool import RFCConnectionPool
+    from .sharding import csv_byte_ranges, csv_is_shardable, read_csv_range
+    from .tracing import TraceRecorder
+    from .validation_rules import column_text, load_rules
 except ImportError:
-    SAP_GUI_AVAILABLE = False
-    print("Warning: win32com not available. SAP GUI scripting will not work.")
+    from excel_reader import iter_excel, map_headers
+    from existence_cache import MaterialExistenceCache
+    from gui_screen import ScreenMap
+    from gui_wait import GuiWaiter
+    from journal import RunJournal
+    from metrics import StageMetrics, timed
+    from profiling import RunProfiler
+    from results_writer import ResultsWriter
+    from retry_policy import CircuitBreaker, RetryPolicy, is_transient
+    from rfc_connection import ReconnectingConnection
+    from rfc_pool import RFCConnectionPool
+    from sharding import csv_byte_ranges, csv_is_shardable, read_csv_range
+    from tracing import TraceRecorder
+    from validation_rules import column_text, load_rules
 
-# Try to import pyrfc for RFC connections
-try:
-    from pyrfc import Connection
-    RFC_AVAILABLE = True
-except ImportError:
-    RFC_AVAILABLE = False
-    print("Warning: pyrfc not available. RFC API functionality will not work.")
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Validator of the current worker process, created on its first shard
+_shard_automation = None
+
+# Background writer of queued log records and the process that started it
+_log_listener = None
+_log_listener_pid = None
+
+
+def _in_worker_process() -> bool:
+    """Check whether this is a child process, e.g. a validation worker"""
+    import multiprocessing
+
+    return multiprocessing.parent_process() is not None
+
+
+def _validate_shard(
+    config_file: str,
+    action: str,
+    shard: Union[pd.DataFrame, Tuple[str, bytes, int, int]]
+) -> Tuple[int, List[Tuple[int, List[str], Dict]]]:
+    """
+    Validate one shard of an input file in a worker process
+
+    Args:
+        config_file: Path to configuration file
+        action: 'create', 'update', or 'validate'
+        shard: DataFrame, or (file_path, header, start, end) byte range of a
+            CSV file to parse here
+
+    Returns:
+        Tuple of (rows, failures) where failures lists (position, errors,
+        material_data) of each invalid record, position counted from 0
+        within the shard
+    """
+    global _shard_automation
+    if _shard_automation is None:
+        _shard_automation = MaterialMasterAutomation(config_file)
+
+    if isinstance(shard, tuple):
+        df = read_csv_range(*shard, **_shard_automation.csv_options())
+    else:
+        df = shard
+    df = df.reset_index(drop=True)
+    _, validation_errors = _shard_automation.validate_dataframe(df, action)
+
+    positions = sorted(validation_errors)
+    failures = [
+        (position, validation_errors[position], material_data)
+        for position, material_data in zip(positions, df.loc[positions].to_dict('records'))
+    ]
+    return len(df), failures
 
 
 class MaterialMasterAutomation:
@@ -40,20 +120,123 @@ class MaterialMasterAutomation:
         'Base_Unit'
     ]
     
+    # Allowed values for validated fields
+    VALID_MATERIAL_TYPES = ['FERT', 'ROH', 'HALB', 'HAWA', 'VERP']
+    VALID_INDUSTRY_SECTORS = ['M', 'C', 'P', 'A']
+
+    # Built-in column rules, in check order; [Rule:<column>] config sections
+    # override their options or add rules (see config_template.ini). Missing
+    # values are checked as the text 'nan', as the original checks did.
+    VALIDATION_RULES = {
+        'Material_Type': {
+            'case': 'upper',
+            'skip_missing': 'false',
+            'allowed': ', '.join(VALID_MATERIAL_TYPES)
+        },
+        'Industry_Sector': {
+            'case': 'upper',
+            'skip_missing': 'false',
+            'allowed': ', '.join(VALID_INDUSTRY_SECTORS)
+        },
+        'Base_Unit': {
+            'strip': 'true',
+            'skip_missing': 'false',
+            'max_length': '3'
+        },
+        'Price': {
+            'type': 'number',
+            'min': '0',
+            'number_message': 'Invalid price value: {value}',
+            'min_message': 'Price cannot be negative'
+        }
+    }
+    
     # SAP return types for RFC success validation
     RFC_SUCCESS_TYPES = ['', 'S', 'W']  # Empty, Success, Warning
+
+    # SAP's default limit of GUI sessions per user and connection
+    MAX_GUI_SESSIONS = 6
+
+    # Subscreen holding the basic data fields of MM01/MM02
+    OVERVIEW_SUBSCREEN = (
+        "wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/"
+        "ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200"
+    )
+
+    # Input fields compared by delta updates, with their BAPI_MATERIAL_GET_DETAIL fields
+    DELTA_FIELDS = {
+        'Material_Type': 'MATL_TYPE',
+        'Industry_Sector': 'IND_SECTOR',
+        'Base_Unit': 'BASE_UOM',
+        'Description': 'MATL_DESC'
+    }
+
+    # Routes of records that are not posted: existing or unchanged materials
+    # are reported as skipped, those whose existence could not be checked
+    # ('unchecked') as failed
+    SKIP_ROUTES = ('skip', 'unchanged', 'unchecked')
+
+    # Declared input dtypes applied at read time: codes are kept as text so
+    # leading zeros survive, low-cardinality codes become categoricals.
+    # Columns not listed here (e.g. Price) are inferred.
+    INPUT_SCHEMA = {
+        'Material_Number': 'str',
+        'Material_Type': 'category',
+        'Industry_Sector': 'category',
+        'Description': 'str',
+        'Base_Unit': 'category',
+        'Material_Group': 'str',
+        'Plant': 'str',
+        'Storage_Location': 'str',
+        'Valuation_Class': 'str',
+        'Currency': 'category'
+    }
     
-    def __init__(self, config_file: str = 'config.ini'):
+    def __init__(
+        self,
+        config_file: str = 'config.ini',
+        rfc_connection_factory: Optional[Callable[..., Any]] = None,
+        gui_engine_factory: Optional[Callable[[], Any]] = None
+    ):
         """
         Initialize the automation tool
         
         Args:
             config_file: Path to configuration file
+            rfc_connection_factory: Callable used instead of pyrfc.Connection
+                to open RFC connections (e.g. fakes.FakeRFCConnection)
+            gui_engine_factory: Callable returning the SAP GUI scripting
+                engine, used instead of win32com (e.g. fakes.FakeScriptingEngine)
         """
+        self.config_file = config_file
         self.config = self._load_config(config_file)
+        self.metrics = StageMetrics()
+        self.metrics_file = self.config.get('Metrics', 'file', fallback='')
+        self.metrics_interval = self.config.getfloat('Metrics', 'interval', fallback=30.0)
+        self._metrics_written = time.monotonic()
         self.logger = self._setup_logging()
+        self.validation_rules = load_rules(self.VALIDATION_RULES, self.config)
         self.sap_session = None
+        self.gui_engine_factory = gui_engine_factory
+        self.gui_session_count = 1
+        self.gui_session_stats = []
+        self._stats_lock = threading.Lock()
+        self.gui_waiter = self._create_gui_waiter()
+        # Screen map of the session used by each thread (COM objects are per thread)
+        self._screens = threading.local()
+        self.retry_policy = self._create_retry_policy()
         self.rfc_connection = None
+        self.rfc_connections = []
+        self.rfc_pool = None
+        self.rfc_connection_factory = rfc_connection_factory
+        self.existence_cache = MaterialExistenceCache(
+            ttl=self.config.getfloat('Automation', 'existence_cache_ttl', fallback=300.0)
+        )
+        self.delta_stats = {'records': 0, 'fields': 0}
+        self.journal = None
+        # Worker threads posting to the RFC pool or GUI sessions during a run
+        self._post_executor = None
+        self._gui_post = None
         self.results = []
         
     def _load_config(self, config_file: str) -> configparser.ConfigParser:
@@ -84,58 +267,256 @@ class MaterialMasterAutomation:
         return config
     
     def _setup_logging(self) -> logging.Logger:
-        """Setup logging configuration"""
+        """
+        Setup logging configuration
+
+        With [Logging] queue_logging the file and console handlers run on a
+        background thread fed through a queue, so log writes do not block
+        processing. Worker processes write directly.
+        """
+        global _log_listener, _log_listener_pid
+
         log_level = self.config.get('Logging', 'log_level', fallback='INFO')
         log_file = self.config.get('Logging', 'log_file', fallback='logs/material_master.log')
+        log_format = self.config.get('Logging', 'log_format', fallback='%(asctime)s - %(levelname)s - %(message)s')
+        self.progress_every = self.config.getint('Logging', 'progress_every', fallback=1000)
+        self.progress_interval = self.config.getfloat('Logging', 'progress_interval', fallback=10.0)
+        self._progress_logged = time.monotonic()
+
+        root = logging.getLogger()
+        if _log_listener is not None and _log_listener_pid != os.getpid():
+            # Forked worker: the parent's writer thread does not run here
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+            for handler in _log_listener.handlers:
+                root.addHandler(handler)
+            _log_listener = None
+        if root.handlers:
+            return logging.getLogger(__name__)
         
         # Create logs directory if it doesn't exist
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
         
         # Configure logging
+        handlers = [
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+        if self.config.getboolean('Logging', 'queue_logging', fallback=True) and not _in_worker_process():
+            import atexit
+            import queue
+            from logging.handlers import QueueHandler, QueueListener
+
+            formatter = logging.Formatter(log_format)
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            log_queue = queue.SimpleQueue()
+            _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            _log_listener_pid = os.getpid()
+            _log_listener.start()
+            atexit.register(_log_listener.stop)
+
+            # The queue handler only merges message and arguments
+            queue_handler = QueueHandler(log_queue)
+            queue_handler.setFormatter(logging.Formatter('%(message)s'))
+            handlers = [queue_handler]
+
         logging.basicConfig(
             level=getattr(logging, log_level),
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
+            format=log_format,
+            handlers=handlers
         )
         
         return logging.getLogger(__name__)
+
+    def _log_progress(self, record_num: int, total: Optional[int] = None):
+        """
+        Log the run's progress at most every [Logging] progress_every records
+        or progress_interval seconds, and at the last record
+        """
+        now = time.monotonic()
+        counted = self.progress_every and record_num % self.progress_every == 0
+        if not counted and record_num != total and now - self._progress_logged < self.progress_interval:
+            return
+        self._progress_logged = now
+        if total:
+            self.logger.info("Processing record %s/%s", record_num, total)
+        else:
+            self.logger.info("Processing record %s", record_num)
     
+    def _create_gui_waiter(self) -> GuiWaiter:
+        """Create the SAP GUI wait engine from configuration"""
+        return GuiWaiter(
+            adaptive=self.config.getboolean('Automation', 'adaptive_wait', fallback=True),
+            fallback_delay=self.config.getfloat('Automation', 'delay_between_actions', fallback=0.5),
+            timeout=self.config.getfloat('Automation', 'wait_timeout', fallback=10.0),
+            poll_interval=self.config.getfloat('Automation', 'poll_interval', fallback=0.02),
+            on_wait=lambda seconds: self.metrics.record('gui_wait', seconds)
+        )
+
+    def _screen_map(self, session: Any) -> ScreenMap:
+        """Get the calling thread's screen map for a SAP GUI session"""
+        screen = getattr(self._screens, 'map', None)
+        if screen is None or screen.session is not session:
+            screen = self._screens.map = ScreenMap(
+                session,
+                enabled=self.config.getboolean('Automation', 'cache_gui_elements', fallback=True)
+            )
+        return screen
+
+    def _create_retry_policy(self) -> RetryPolicy:
+        """Create the RFC retry policy and circuit breaker from configuration"""
+        return RetryPolicy(
+            max_retries=self.config.getint('Automation', 'max_retries', fallback=3),
+            base_delay=self.config.getfloat('Automation', 'retry_base_delay', fallback=0.5),
+            max_delay=self.config.getfloat('Automation', 'retry_max_delay', fallback=30.0),
+            breaker=CircuitBreaker(
+                threshold=self.config.getint('Automation', 'breaker_threshold', fallback=5),
+                cooldown=self.config.getfloat('Automation', 'breaker_cooldown', fallback=30.0)
+            )
+        )
+
+    def _call_rfc(self, connection: Any, function: str, **params: Any) -> Dict:
+        """
+        Call a remote function, retrying transient failures
+
+        Communication errors and resource shortages are retried with
+        exponential backoff ([Automation] max_retries); while the circuit
+        breaker is open after repeated failures, all workers wait.
+
+        Args:
+            connection: RFC connection
+            function: Name of the remote function
+            params: Function parameters
+
+        Returns:
+            Result dictionary of the call
+        """
+        def on_retry(attempt: int, error: Exception, delay: float):
+            self.logger.warning(
+                "%s failed: %s; retry %s/%s in %.1fs",
+                function, error, attempt, self.retry_policy.max_retries, delay
+            )
+
+        started = time.perf_counter()
+        try:
+            return self.retry_policy.call(connection.call, function, on_retry=on_retry, **params)
+        finally:
+            self.metrics.record(
+                'rfc_call',
+                time.perf_counter() - started,
+                track=getattr(connection, 'name', None),
+                function=function
+            )
+
+    def _get_scripting_engine(self) -> Any:
+        """Get the SAP GUI scripting engine for the calling thread"""
+        if self.gui_engine_factory is not None:
+            return self.gui_engine_factory()
+        import win32com.client
+        sap_gui = win32com.client.GetObject("SAPGUI")
+        return sap_gui.GetScriptingEngine
+
+    @timed('connect_gui')
     def connect_sap_gui(self) -> bool:
         """
         Connect to SAP GUI
+
+        When [SAP] gui_sessions is greater than 1, also attaches to or opens
+        that many sessions on the first connection (at most MAX_GUI_SESSIONS)
+        so records can be posted by one worker per session.
         
         Returns:
             True if connection successful, False otherwise
         """
-        if not SAP_GUI_AVAILABLE:
-            self.logger.error("SAP GUI scripting not available (win32com not installed)")
-            return False
+        if self.gui_engine_factory is None:
+            try:
+                import win32com.client  # noqa: F401 (SAP GUI scripting, Windows only)
+            except ImportError:
+                self.logger.error("SAP GUI scripting not available (win32com not installed)")
+                return False
         
         try:
             self.logger.info("Connecting to SAP GUI...")
-            sap_gui = win32com.client.GetObject("SAPGUI")
-            application = sap_gui.GetScriptingEngine
+            application = self._get_scripting_engine()
             connection = application.Children(0)
             self.sap_session = connection.Children(0)
+
+            requested = self.config.getint('SAP', 'gui_sessions', fallback=1)
+            self._open_gui_sessions(connection, max(1, min(requested, self.MAX_GUI_SESSIONS)))
+
             self.logger.info("Successfully connected to SAP GUI")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to connect to SAP GUI: {str(e)}")
+            self.logger.error("Failed to connect to SAP GUI: %s", e)
             return False
+
+    def _open_gui_sessions(self, connection: Any, count: int):
+        """
+        Make sure the connection has at least count sessions
+
+        Args:
+            connection: SAP GUI connection
+            count: Number of sessions to use
+        """
+        timeout = self.config.getfloat('Automation', 'wait_timeout', fallback=10.0)
+
+        while connection.Children.Count < count:
+            existing = connection.Children.Count
+            connection.Children(0).CreateSession()
+
+            # New sessions appear asynchronously
+            deadline = time.perf_counter() + timeout
+            while connection.Children.Count <= existing:
+                if time.perf_counter() >= deadline:
+                    raise TimeoutError(f"SAP GUI session {existing + 1} did not open")
+                time.sleep(0.1)
+
+        self.gui_session_count = count
+        self.gui_session_stats = [
+            {'session': slot, 'calls': 0, 'busy_seconds': 0.0} for slot in range(count)
+        ]
+        if count > 1:
+            self.logger.info("Using %s SAP GUI sessions", count)
+
+    def _attach_gui_session(self, slot: int) -> Any:
+        """
+        Attach the calling worker thread to one SAP GUI session
+
+        COM objects cannot be shared between threads, so every worker
+        initializes COM and looks up its own session.
+
+        Args:
+            slot: Index of the session on the first connection
+
+        Returns:
+            SAP GUI session
+        """
+        if self.gui_engine_factory is None:
+            import pythoncom
+            pythoncom.CoInitialize()
+        return self._get_scripting_engine().Children(0).Children(slot)
     
+    @timed('connect_rfc')
     def connect_rfc(self) -> bool:
         """
         Connect to SAP using RFC
+
+        Opens a pool of connections instead of a single one when
+        [RFC] pool_size is greater than 1. Connections are checked with
+        RFC_PING after [RFC] ping_after_idle seconds without calls and
+        reopened with the same settings when the link to SAP drops.
         
         Returns:
             True if connection successful, False otherwise
         """
-        if not RFC_AVAILABLE:
-            self.logger.error("RFC not available (pyrfc not installed)")
-            return False
+        factory = self.rfc_connection_factory
+        if factory is None:
+            try:
+                from pyrfc import Connection
+            except ImportError:
+                self.logger.error("RFC not available (pyrfc not installed)")
+                return False
         
         try:
             self.logger.info("Connecting to SAP via RFC...")
@@ -149,17 +530,44 @@ class MaterialMasterAutomation:
             }
             
             # Check if RFC config is complete
-            if not all([rfc_config['ashost'], rfc_config['user'], rfc_config['passwd']]):
-                self.logger.warning("RFC configuration incomplete")
-                return False
-            
-            self.rfc_connection = Connection(**rfc_config)
+            if factory is None:
+                if not all([rfc_config['ashost'], rfc_config['user'], rfc_config['passwd']]):
+                    self.logger.warning("RFC configuration incomplete")
+                    return False
+                factory = Connection
+
+            ping_after = self.config.getfloat('RFC', 'ping_after_idle', fallback=60.0)
+            self.rfc_connections = []
+
+            def open_connection() -> ReconnectingConnection:
+                slot = len(self.rfc_connections)
+
+                def on_reconnect(reason: str):
+                    self.logger.warning("Reopened RFC connection %s (%s)", slot, reason)
+
+                connection = ReconnectingConnection(
+                    lambda: factory(**rfc_config),
+                    ping_after,
+                    on_reconnect,
+                    name=f"RFC connection {slot}"
+                )
+                self.rfc_connections.append(connection)
+                return connection
+
+            pool_size = self.config.getint('RFC', 'pool_size', fallback=1)
+            if pool_size > 1:
+                self.rfc_pool = RFCConnectionPool(open_connection, pool_size)
+                self.logger.info("Successfully opened %s RFC connections to SAP", pool_size)
+                return True
+
+            self.rfc_connection = open_connection()
             self.logger.info("Successfully connected to SAP via RFC")
             return True
         except Exception as e:
-            self.logger.error(f"Failed to connect via RFC: {str(e)}")
+            self.logger.error("Failed to connect via RFC: %s", e)
             return False
     
+    @timed('validate_record')
     def validate_material_data(
         self,
         material_data: Dict,
@@ -175,6 +583,8 @@ class MaterialMasterAutomation:
         Returns:
             Tuple of (is_valid, list_of_errors)
         """
+        import pandas as pd
+
         errors = []
         
         # Check mandatory fields
@@ -190,115 +600,350 @@ class MaterialMasterAutomation:
             if pd.isna(material_number) or not str(material_number).strip() or str(material_number).lower() == 'nan':
                 errors.append("Material_Number is required for updates")
 
-        # Validate material type
-        valid_material_types = ['FERT', 'ROH', 'HALB', 'HAWA', 'VERP']
-        if 'Material_Type' in material_data:
-            mat_type = str(material_data['Material_Type']).upper()
-            if mat_type and mat_type not in valid_material_types:
-                errors.append(f"Invalid Material Type: {mat_type}")
-        
-        # Validate industry sector
-        valid_sectors = ['M', 'C', 'P', 'A']
-        if 'Industry_Sector' in material_data:
-            sector = str(material_data['Industry_Sector']).upper()
-            if sector and sector not in valid_sectors:
-                errors.append(f"Invalid Industry Sector: {sector}")
-        
-        # Validate base unit
-        if 'Base_Unit' in material_data:
-            base_unit = str(material_data['Base_Unit']).strip()
-            if base_unit and len(base_unit) > 3:
-                errors.append(f"Base Unit too long: {base_unit}")
-        
-        # Validate price if provided
-        if 'Price' in material_data and material_data['Price']:
-            try:
-                price = float(material_data['Price'])
-                if price < 0:
-                    errors.append("Price cannot be negative")
-            except (ValueError, TypeError):
-                errors.append(f"Invalid price value: {material_data['Price']}")
+        # Apply the column rules (material type, sector, base unit, price, ...)
+        for rule in self.validation_rules:
+            if rule.column in material_data:
+                errors.extend(rule.check_value(material_data[rule.column]))
         
         is_valid = len(errors) == 0
         return is_valid, errors
+
+    @staticmethod
+    def _missing_mask(column: Optional[pd.Series], length: int) -> np.ndarray:
+        """
+        Vectorized counterpart of the per-row missing/empty/'nan' check
+
+        Args:
+            column: Column to check, or None if the column is absent
+            length: Number of rows in the DataFrame
+
+        Returns:
+            Boolean array, True where the value is missing or empty
+        """
+        import numpy as np
+
+        if column is None:
+            return np.ones(length, dtype=bool)
+        text = column_text(column)
+        return (
+            column.isna().to_numpy()
+            | (np.char.str_len(np.char.strip(text)) == 0)
+            | (np.char.lower(text) == 'nan')
+        )
+
+    @timed('validate')
+    def validate_dataframe(
+        self,
+        df: pd.DataFrame,
+        action: str = 'create'
+    ) -> Tuple[pd.Series, Dict]:
+        """
+        Validate all material records of a DataFrame with column-wise operations
+
+        Applies the same rules as validate_material_data, producing identical
+        error messages, but evaluates each rule once per column instead of
+        once per row.
+
+        Args:
+            df: DataFrame with material data
+            action: 'create', 'update', or 'validate'
+
+        Returns:
+            Tuple of (error_mask, errors) where error_mask is a boolean Series
+            aligned to df.index (True for invalid records) and errors maps the
+            index label of each invalid record to its list of errors
+        """
+        import numpy as np
+        import pandas as pd
+
+        length = len(df)
+        checks = []
+
+        def column(field: str) -> Optional[pd.Series]:
+            return df[field] if field in df.columns else None
+
+        # Check mandatory fields
+        if action != 'update':
+            for field in self.MANDATORY_FIELDS:
+                checks.append((
+                    self._missing_mask(column(field), length),
+                    f"Mandatory field '{field}' is missing or empty"
+                ))
+
+        if action == 'update':
+            checks.append((
+                self._missing_mask(column('Material_Number'), length),
+                "Material_Number is required for updates"
+            ))
+
+        # Apply the column rules (material type, sector, base unit, price, ...)
+        for rule in self.validation_rules:
+            if rule.column in df.columns:
+                checks.extend(rule.check_column(df[rule.column]))
+
+        # Collect messages only for the flagged rows, preserving rule order
+        error_mask = np.zeros(length, dtype=bool)
+        errors: Dict = {}
+        labels = df.index
+        for mask, messages in checks:
+            error_mask |= mask
+            for position in np.flatnonzero(mask):
+                message = messages if isinstance(messages, str) else str(messages[position])
+                errors.setdefault(labels[position], []).append(message)
+
+        return pd.Series(error_mask, index=df.index), errors
     
-    def read_input_file(self, file_path: str) -> pd.DataFrame:
+    def read_input_file(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None
+    ) -> Union[pd.DataFrame, Iterable[pd.DataFrame]]:
         """
-        Read input file (CSV or Excel)
+        Read input file (CSV, Excel, Parquet or Feather)
+
+        Only the columns the tool uses are read (see input_columns). CSV
+        and Excel columns get the dtypes of INPUT_SCHEMA; Parquet and
+        Feather files keep their stored types and require pyarrow.
         
         Args:
             file_path: Path to input file
+            chunksize: If given, stream the file in DataFrames of at most
+                this many records instead of loading it at once
             
         Returns:
-            DataFrame with material data
+            DataFrame with material data, or an iterable of DataFrames when
+            chunksize is given
         """
-        self.logger.info(f"Reading input file: {file_path}")
+        if chunksize:
+            return self.iter_input_file(file_path, chunksize)
+
+        import pandas as pd
+
+        self.logger.info("Reading input file: %s", file_path)
         
         try:
             if file_path.endswith('.csv'):
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(file_path, **self.csv_options())
             elif file_path.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(file_path)
+                sheet, header_row, column_map = self._excel_options()
+                # Read cells as stored; text codes such as '0001' must not be parsed as numbers
+                df = pd.read_excel(file_path, sheet_name=sheet or 0, header=header_row - 1, dtype=object)
+                df.columns = map_headers(list(df.columns), column_map)
+                df = self._apply_schema(df)
+            elif file_path.endswith(('.parquet', '.pq')):
+                df = pd.read_parquet(file_path, columns=self._columnar_columns(file_path))
+            elif file_path.endswith(('.feather', '.arrow')):
+                df = pd.read_feather(file_path, columns=self._columnar_columns(file_path))
             else:
                 raise ValueError(f"Unsupported file format: {file_path}")
             
-            self.logger.info(f"Successfully read {len(df)} records from file")
+            self.logger.info("Successfully read %s records from file", len(df))
             return df
         except Exception as e:
-            self.logger.error(f"Error reading file: {str(e)}")
+            self.logger.error("Error reading file: %s", e)
+            raise
+
+    def iter_input_file(self, file_path: str, chunksize: int) -> Iterable[pd.DataFrame]:
+        """
+        Stream input file in chunks so memory is bounded by chunk size
+
+        The file is opened immediately, so a missing file or unsupported
+        format raises here rather than on first iteration. Chunks keep a
+        continuous index across the whole file.
+
+        Args:
+            file_path: Path to input file
+            chunksize: Maximum number of records per chunk
+
+        Returns:
+            Iterable of DataFrames with material data
+        """
+        import pandas as pd
+
+        self.logger.info("Streaming input file: %s (chunks of %s records)", file_path, chunksize)
+
+        try:
+            if file_path.endswith('.csv'):
+                return pd.read_csv(file_path, chunksize=chunksize, **self.csv_options())
+            elif file_path.endswith(('.parquet', '.pq')):
+                return self._iter_parquet(file_path, chunksize)
+            elif file_path.endswith('.xlsx'):
+                sheet, header_row, column_map = self._excel_options()
+                chunks = iter_excel(file_path, chunksize, sheet, header_row, column_map)
+                return (self._apply_schema(chunk) for chunk in chunks)
+            elif file_path.endswith(('.xls', '.feather', '.arrow')):
+                # No incremental reader for these formats; slice the table
+                df = self.read_input_file(file_path)
+                return (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+            else:
+                raise ValueError(f"Unsupported file format: {file_path}")
+        except Exception as e:
+            self.logger.error("Error reading file: %s", e)
             raise
     
-    def create_material_gui(self, material_data: Dict) -> Tuple[bool, str]:
+    def _excel_options(self) -> Tuple[Union[str, int, None], int, Dict[str, str]]:
+        """
+        Read the Excel input options
+
+        Returns:
+            Tuple of (sheet, header_row, column_map) from [Excel] sheet (name
+            or 0-based index), [Excel] header_row (1-based) and the
+            [Excel Columns] header mapping
+        """
+        sheet = self.config.get('Excel', 'sheet', fallback='').strip() or None
+        if sheet is not None and sheet.isdigit():
+            sheet = int(sheet)
+        header_row = self.config.getint('Excel', 'header_row', fallback=1)
+        column_map = dict(self.config.items('Excel Columns', raw=True)) if self.config.has_section('Excel Columns') else {}
+        return sheet, header_row, column_map
+
+    def input_columns(self) -> List[str]:
+        """
+        List the input columns the tool reads
+
+        Returns:
+            Mandatory fields, the INPUT_SCHEMA columns and every column with
+            a validation rule, in that order
+        """
+        columns = [*self.MANDATORY_FIELDS, *self.INPUT_SCHEMA]
+        columns += [rule.column for rule in self.validation_rules]
+        return list(dict.fromkeys(columns))
+
+    def csv_options(self) -> Dict[str, Any]:
+        """
+        Build the pandas.read_csv arguments that apply the input schema
+
+        Returns:
+            Keyword arguments restricting the columns read to input_columns
+            and setting the INPUT_SCHEMA dtypes
+        """
+        wanted = set(self.input_columns())
+        return {
+            'usecols': lambda column: column in wanted,
+            'dtype': {column: str if dtype == 'str' else dtype for column, dtype in self.INPUT_SCHEMA.items()}
+        }
+
+    def _apply_schema(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the input schema to a DataFrame read without it (Excel)
+
+        Keeps the input columns and converts the INPUT_SCHEMA columns to
+        text, whole numbers without a trailing '.0' (Excel stores codes such
+        as 1000 as numbers, which become floats next to empty cells).
+
+        Args:
+            df: DataFrame as read from the file
+
+        Returns:
+            DataFrame with the declared dtypes
+        """
+        import pandas as pd
+
+        wanted = set(self.input_columns())
+        df = df[[column for column in df.columns if column in wanted]].infer_objects()
+        for column, dtype in self.INPUT_SCHEMA.items():
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy(dtype=object)
+            missing = df[column].isna().to_numpy()
+            text = pd.Series([
+                float('nan') if is_missing
+                else str(int(value)) if isinstance(value, float) and value.is_integer()
+                else str(value)
+                for value, is_missing in zip(values, missing)
+            ], index=df.index, dtype=object).infer_objects()
+            df[column] = text.astype('category') if dtype == 'category' else text
+        return df
+
+    def _columnar_columns(self, file_path: str) -> List[str]:
+        """Project a Parquet or Feather file to the input columns it has, in file order"""
+        import pyarrow.ipc
+        import pyarrow.parquet
+
+        if file_path.endswith(('.parquet', '.pq')):
+            names = pyarrow.parquet.read_schema(file_path).names
+        else:
+            with pyarrow.memory_map(file_path) as source:
+                names = pyarrow.ipc.open_file(source).schema.names
+        wanted = set(self.input_columns())
+        return [name for name in names if name in wanted]
+
+    def _iter_parquet(self, file_path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Stream a Parquet file in record batches with a continuous index"""
+        import pandas as pd
+        import pyarrow.parquet
+
+        # Open now so that a missing or corrupt file fails before iteration
+        batches = pyarrow.parquet.ParquetFile(file_path).iter_batches(
+            batch_size=chunksize,
+            columns=self._columnar_columns(file_path)
+        )
+
+        def frames() -> Iterator[pd.DataFrame]:
+            start = 0
+            for batch in batches:
+                df = batch.to_pandas()
+                df.index = pd.RangeIndex(start, start + len(df))
+                start += len(df)
+                yield df
+
+        return frames()
+
+    @timed('create_gui')
+    def create_material_gui(self, material_data: Dict, session: Any = None) -> Tuple[bool, str]:
         """
         Create material using SAP GUI scripting
         
         Args:
             material_data: Dictionary containing material data
+            session: SAP GUI session to use instead of self.sap_session
             
         Returns:
             Tuple of (success, message)
         """
-        if not self.sap_session:
+        session = session or self.sap_session
+        if not session:
             return False, "SAP GUI session not connected"
         
         try:
-            delay = float(self.config.get('Automation', 'delay_between_actions', fallback='0.5'))
             transaction = self.config.get('SAP', 'transaction_code', fallback='MM01')
             
+            screen = self._screen_map(session)
+
             # Start transaction
-            self.logger.info(f"Starting transaction {transaction}")
-            self.sap_session.StartTransaction(transaction)
-            time.sleep(delay)
+            self.logger.debug("Starting transaction %s", transaction)
+            screen.start_transaction(transaction)
+            self.gui_waiter.wait(session)
             
             # Fill in material type
-            self.sap_session.findById("wnd[0]/usr/ctxtRMMG1-MBRSH").text = material_data.get('Industry_Sector', 'M')
-            self.sap_session.findById("wnd[0]/usr/ctxtRMMG1-MTART").text = material_data.get('Material_Type', '')
-            time.sleep(delay)
+            screen.set_text("wnd[0]/usr/ctxtRMMG1-MBRSH", material_data.get('Industry_Sector', 'M'))
+            screen.set_text("wnd[0]/usr/ctxtRMMG1-MTART", material_data.get('Material_Type', ''))
+            self.gui_waiter.wait(session)
             
             # Press Enter
-            self.sap_session.findById("wnd[0]").sendVKey(0)
-            time.sleep(delay)
+            screen.send_vkey(0)
+            self.gui_waiter.wait(session)
             
             # Fill in description
-            self.sap_session.findById("wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/ctxtMAKT-MAKTX").text = material_data.get('Description', '')
+            screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMAKT-MAKTX", material_data.get('Description', ''))
             
             # Fill in base unit
-            self.sap_session.findById("wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/ctxtMARA-MEINS").text = material_data.get('Base_Unit', '')
+            screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMARA-MEINS", material_data.get('Base_Unit', ''))
             
             # Fill in material group if provided
             if material_data.get('Material_Group'):
-                self.sap_session.findById("wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/ctxtMARA-MATKL").text = str(material_data['Material_Group'])
+                screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMARA-MATKL", str(material_data['Material_Group']))
             
-            time.sleep(delay)
+            self.gui_waiter.wait(session)
             
             # Save (this is a simulation - actual field IDs may vary)
-            self.sap_session.findById("wnd[0]").sendVKey(11)  # Ctrl+S
-            time.sleep(delay * 2)
+            screen.send_vkey(11)  # Ctrl+S
+            self.gui_waiter.wait(session, factor=2)
             
             # Get material number from status bar
-            status_text = self.sap_session.findById("wnd[0]/sbar").text
+            status_text = screen.status_text()
             
-            self.logger.info(f"Material created successfully: {status_text}")
+            self.logger.debug("Material created successfully: %s", status_text)
             return True, status_text
             
         except Exception as e:
@@ -306,69 +951,59 @@ class MaterialMasterAutomation:
             self.logger.error(error_msg)
             return False, error_msg
 
-    def update_material_gui(self, material_data: Dict) -> Tuple[bool, str]:
+    @timed('update_gui')
+    def update_material_gui(self, material_data: Dict, session: Any = None) -> Tuple[bool, str]:
         """
         Update material using SAP GUI scripting
 
         Args:
             material_data: Dictionary containing material data
+            session: SAP GUI session to use instead of self.sap_session
 
         Returns:
             Tuple of (success, message)
         """
-        if not self.sap_session:
+        session = session or self.sap_session
+        if not session:
             return False, "SAP GUI session not connected"
 
         try:
-            delay = float(self.config.get('Automation', 'delay_between_actions', fallback='0.5'))
             transaction = self.config.get('SAP', 'transaction_code_update', fallback='MM02')
 
+            screen = self._screen_map(session)
+
             # Start transaction
-            self.logger.info(f"Starting transaction {transaction}")
-            self.sap_session.StartTransaction(transaction)
-            time.sleep(delay)
+            self.logger.debug("Starting transaction %s", transaction)
+            screen.start_transaction(transaction)
+            self.gui_waiter.wait(session)
 
             # Enter material number
-            self.sap_session.findById("wnd[0]/usr/ctxtRMMG1-MATNR").text = str(
-                material_data.get('Material_Number', '')
-            )
-            self.sap_session.findById("wnd[0]").sendVKey(0)
-            time.sleep(delay)
+            screen.set_text("wnd[0]/usr/ctxtRMMG1-MATNR", str(material_data.get('Material_Number', '')))
+            screen.send_vkey(0)
+            self.gui_waiter.wait(session)
 
             # Update description if provided
             if material_data.get('Description'):
-                self.sap_session.findById(
-                    "wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/"
-                    "ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/"
-                    "ctxtMAKT-MAKTX"
-                ).text = material_data.get('Description', '')
+                screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMAKT-MAKTX", material_data.get('Description', ''))
 
             # Update base unit if provided
             if material_data.get('Base_Unit'):
-                self.sap_session.findById(
-                    "wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/"
-                    "ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/"
-                    "ctxtMARA-MEINS"
-                ).text = material_data.get('Base_Unit', '')
+                screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMARA-MEINS", material_data.get('Base_Unit', ''))
 
             # Update material group if provided
             if material_data.get('Material_Group'):
-                self.sap_session.findById(
-                    "wnd[0]/usr/tabsTAXI_TABSTRIP_OVERVIEW/tabpOVERVIEW/"
-                    "ssubSUBSCREEN_BODY:SAPLMGMM:2100/subSUB_VIEWSET:SAPLMGMM:2200/"
-                    "ctxtMARA-MATKL"
-                ).text = str(material_data['Material_Group'])
+                screen.set_text(f"{self.OVERVIEW_SUBSCREEN}/ctxtMARA-MATKL", str(material_data['Material_Group']))
 
-            time.sleep(delay)
+            self.gui_waiter.wait(session)
 
             # Save changes (this is a simulation - actual field IDs may vary)
-            self.sap_session.findById("wnd[0]").sendVKey(11)  # Ctrl+S
-            time.sleep(delay * 2)
+            screen.send_vkey(11)  # Ctrl+S
+            self.gui_waiter.wait(session, factor=2)
 
             # Get status message
-            status_text = self.sap_session.findById("wnd[0]/sbar").text
+            status_text = screen.status_text()
 
-            self.logger.info(f"Material updated successfully: {status_text}")
+            self.logger.debug("Material updated successfully: %s", status_text)
             return True, status_text
 
         except Exception as e:
@@ -376,17 +1011,20 @@ class MaterialMasterAutomation:
             self.logger.error(error_msg)
             return False, error_msg
     
-    def create_material_rfc(self, material_data: Dict) -> Tuple[bool, str]:
+    @timed('create_rfc')
+    def create_material_rfc(self, material_data: Dict, connection: Any = None) -> Tuple[bool, str]:
         """
         Create material using RFC API
         
         Args:
             material_data: Dictionary containing material data
+            connection: RFC connection to use instead of self.rfc_connection
             
         Returns:
             Tuple of (success, message)
         """
-        if not self.rfc_connection:
+        connection = connection or self.rfc_connection
+        if not connection:
             return False, "RFC connection not established"
         
         try:
@@ -394,7 +1032,8 @@ class MaterialMasterAutomation:
             # Note: This is a simplified example. Actual implementation requires
             # proper BAPI structure understanding
             
-            result = self.rfc_connection.call(
+            result = self._call_rfc(
+                connection,
                 'BAPI_MATERIAL_SAVEDATA',
                 HEADDATA={
                     'MATERIAL': material_data.get('Material_Number', ''),
@@ -413,11 +1052,12 @@ class MaterialMasterAutomation:
             
             if result.get('RETURN', {}).get('TYPE') in self.RFC_SUCCESS_TYPES:
                 material_number = result.get('NUMBER', '')
-                self.logger.info(f"Material created successfully via RFC: {material_number}")
+                self._remember_created(material_number)
+                self.logger.debug("Material created successfully via RFC: %s", material_number)
                 return True, f"Material {material_number} created successfully"
             else:
                 error_msg = result.get('RETURN', {}).get('MESSAGE', 'Unknown error')
-                self.logger.error(f"RFC error: {error_msg}")
+                self.logger.error("RFC error: %s", error_msg)
                 return False, error_msg
                 
         except Exception as e:
@@ -425,17 +1065,20 @@ class MaterialMasterAutomation:
             self.logger.error(error_msg)
             return False, error_msg
 
-    def update_material_rfc(self, material_data: Dict) -> Tuple[bool, str]:
+    @timed('update_rfc')
+    def update_material_rfc(self, material_data: Dict, connection: Any = None) -> Tuple[bool, str]:
         """
         Update material using RFC API
 
         Args:
             material_data: Dictionary containing material data
+            connection: RFC connection to use instead of self.rfc_connection
 
         Returns:
             Tuple of (success, message)
         """
-        if not self.rfc_connection:
+        connection = connection or self.rfc_connection
+        if not connection:
             return False, "RFC connection not established"
 
         try:
@@ -459,7 +1102,8 @@ class MaterialMasterAutomation:
                     'MATL_DESC': material_data.get('Description', '')
                 }
 
-            result = self.rfc_connection.call(
+            result = self._call_rfc(
+                connection,
                 'BAPI_MATERIAL_SAVEDATA',
                 HEADDATA=head_data,
                 CLIENTDATA=client_data,
@@ -468,174 +1112,1459 @@ class MaterialMasterAutomation:
 
             if result.get('RETURN', {}).get('TYPE') in self.RFC_SUCCESS_TYPES:
                 material_number = result.get('NUMBER', '')
-                self.logger.info(f"Material updated successfully via RFC: {material_number}")
+                self.logger.debug("Material updated successfully via RFC: %s", material_number)
                 return True, f"Material {material_number} updated successfully"
             else:
                 error_msg = result.get('RETURN', {}).get('MESSAGE', 'Unknown error')
-                self.logger.error(f"RFC error: {error_msg}")
+                self.logger.error("RFC error: %s", error_msg)
                 return False, error_msg
 
         except Exception as e:
             error_msg = f"Error updating material via RFC: {str(e)}"
             self.logger.error(error_msg)
             return False, error_msg
-    
-    def process_materials(self, file_path: str, method: str = 'gui', action: str = 'create') -> Dict:
+
+    @staticmethod
+    def _is_blank(value: Any) -> bool:
+        """Check if a value is missing, NaN, or an empty string"""
+        return value is None or value != value or not str(value).strip()
+
+    @classmethod
+    def _material_key(cls, value: Any) -> Optional[str]:
+        """Convert a material number to SAP's internal (zero-padded) format"""
+        if cls._is_blank(value):
+            return None
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        text = str(value).strip().upper()
+        return text.zfill(18) if text.isdigit() else text
+
+    def _remember_created(self, material_number: Any):
+        """Mark a newly created material as existing in the existence cache"""
+        key = self._material_key(material_number)
+        if key:
+            self.existence_cache.add(key)
+
+    def find_existing_materials(self, material_numbers: Iterable[Any], connection: Any = None) -> Set[str]:
         """
-        Process materials from input file
+        Find which material numbers already exist in SAP
+
+        Numbers not in the existence cache are read from table MARA with
+        RFC_READ_TABLE, at most [Automation] existence_batch_size numbers
+        per call so the WHERE clause stays within SAP's limits.
+
+        Args:
+            material_numbers: Material numbers as given in the input
+            connection: RFC connection to use instead of the pool or
+                self.rfc_connection
+
+        Returns:
+            Existing material numbers in SAP internal format
+
+        Raises:
+            Exception: If a lookup failed; numbers read by earlier calls
+                are cached all the same
+        """
+        keys = [key for key in map(self._material_key, material_numbers) if key]
+        existing, unknown = self.existence_cache.lookup(keys)
+        if not unknown:
+            return existing
+
+        batch_size = max(1, self.config.getint('Automation', 'existence_batch_size', fallback=500))
+
+        def read(connection: Any) -> Set[str]:
+            found = set()
+            for start in range(0, len(unknown), batch_size):
+                batch = unknown[start:start + batch_size]
+                batch_found = self._read_existing_materials(batch, connection)
+                self.existence_cache.store(batch, batch_found)
+                found |= batch_found
+            return found
+
+        if connection is None and self.rfc_pool:
+            with self.rfc_pool.connection() as pooled:
+                return existing | read(pooled)
+        return existing | read(connection or self.rfc_connection)
+
+    def _read_existing_materials(self, keys: List[str], connection: Any) -> Set[str]:
+        """
+        Read which of the given material numbers exist in table MARA
+
+        Args:
+            keys: Material numbers in SAP internal format
+            connection: RFC connection
+
+        Returns:
+            The subset of keys found in MARA
+        """
+        if not connection:
+            raise ConnectionError("RFC connection not established")
+
+        # WHERE clause lines are limited to 72 characters, so one number per line
+        literals = ["'" + key.replace("'", "''") + "'" for key in keys]
+        options = [{'TEXT': 'MATNR IN ('}]
+        options += [{'TEXT': literal + ','} for literal in literals[:-1]]
+        options += [{'TEXT': literals[-1]}, {'TEXT': ')'}]
+
+        result = self._call_rfc(
+            connection,
+            'RFC_READ_TABLE',
+            QUERY_TABLE='MARA',
+            DELIMITER='|',
+            FIELDS=[{'FIELDNAME': 'MATNR'}],
+            OPTIONS=options
+        )
+        return {row['WA'].strip() for row in result.get('DATA', [])} & set(keys)
+
+    def _existence_mode(self, method: str, action: str) -> Optional[str]:
+        """Return 'skip' or 'update' if creates of existing materials are rerouted"""
+        mode = self.config.get('Automation', 'existing_materials', fallback='create').strip().lower()
+        if method == 'rfc' and action == 'create' and mode in ('skip', 'update'):
+            return mode
+        return None
+
+    def _existing_routes(
+        self,
+        records: List[Tuple[int, Dict]],
+        method: str,
+        action: str
+    ) -> Dict[int, str]:
+        """
+        Decide which records to create are skipped or updated because they exist
+
+        Controlled by [Automation] existing_materials: 'create' (default)
+        posts every record, 'skip' leaves existing materials alone and
+        'update' changes them instead. Only RFC creates are checked.
 
         Args:
-            file_path: Path to input CSV or Excel file
+            records: (record_num, material_data) tuples of one chunk
             method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
             action: 'create', 'update', or 'validate'
 
         Returns:
-            Dictionary with processing results
+            Dictionary mapping record numbers to 'skip' or 'update', or
+            to 'unchecked' for every record with a material number if the
+            lookup failed
         """
-        self.logger.info(
-            f"Starting material processing from {file_path} using {method} method ({action})"
-        )
-        
-        # Read input file
+        mode = self._existence_mode(method, action)
+        if not mode:
+            return {}
+
+        keys = {record_num: self._material_key(material_data.get('Material_Number'))
+                for record_num, material_data in records}
         try:
-            df = self.read_input_file(file_path)
+            existing = self.find_existing_materials([key for key in keys.values() if key])
         except Exception as e:
-            return {
-                'status': 'error',
-                'message': f"Failed to read input file: {str(e)}",
-                'total': 0,
-                'success': 0,
-                'failed': 0,
-                'results': []
-            }
-        
-        # Connect to SAP (skip if only validating)
-        if action != 'validate':
-            if method == 'gui':
-                if not self.connect_sap_gui():
-                    return {
-                        'status': 'error',
-                        'message': 'Failed to connect to SAP GUI',
-                        'total': len(df),
-                        'success': 0,
-                        'failed': 0,
-                        'results': []
-                    }
-            elif method == 'rfc':
-                if not self.connect_rfc():
-                    return {
-                        'status': 'error',
-                        'message': 'Failed to connect via RFC',
-                        'total': len(df),
-                        'success': 0,
-                        'failed': 0,
-                        'results': []
-                    }
-        
-        # Process each material
-        results = []
-        success_count = 0
-        failed_count = 0
-        
-        for idx, row in df.iterrows():
-            material_data = row.to_dict()
-            record_num = idx + 1
-            
-            self.logger.info(f"Processing record {record_num}/{len(df)}")
-            
-            # Validate data
-            is_valid, errors = self.validate_material_data(
-                material_data,
-                require_material_number=action == 'update',
-                validate_mandatory_fields=action != 'update'
-            )
-            
-            if not is_valid:
-                result = {
-                    'record': record_num,
-                    'status': 'failed',
-                    'message': f"Validation failed: {'; '.join(errors)}",
-                    'data': material_data
-                }
-                self.logger.warning(f"Record {record_num} validation failed: {errors}")
-                results.append(result)
-                failed_count += 1
-                continue
-            
-            if action == 'validate':
-                success = True
-                message = "Validation successful"
-            elif action == 'create':
-                if method == 'gui':
-                    success, message = self.create_material_gui(material_data)
-                else:  # rfc
-                    success, message = self.create_material_rfc(material_data)
-            else:  # update
-                if method == 'gui':
-                    success, message = self.update_material_gui(material_data)
-                else:  # rfc
-                    success, message = self.update_material_rfc(material_data)
-            
-            result = {
-                'record': record_num,
-                'status': 'success' if success else 'failed',
-                'message': message,
-                'data': material_data
-            }
-            results.append(result)
-            
-            if success:
-                success_count += 1
-            else:
-                failed_count += 1
-        
-        # Generate summary
-        summary = {
-            'status': 'completed',
-            'total': len(df),
-            'success': success_count,
-            'failed': failed_count,
-            'results': results,
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        self.logger.info(f"Processing completed. Success: {success_count}, Failed: {failed_count}")
+            # Creating them anyway could duplicate or overwrite materials
+            self.logger.error("Could not check for existing materials: %s", e)
+            return {record_num: 'unchecked' for record_num, key in keys.items() if key}
+        return {record_num: mode for record_num, key in keys.items() if key in existing}
+
+    def fetch_material_details(self, material_numbers: Iterable[Any], connection: Any = None) -> Dict[str, Dict]:
+        """
+        Read the current general data of materials with BAPI_MATERIAL_GET_DETAIL
+
+        The BAPI reads one material per call, so the calls for all numbers
+        are spread over the connection pool when one is open.
+
+        Args:
+            material_numbers: Material numbers as given in the input
+            connection: RFC connection to use instead of the pool or
+                self.rfc_connection
+
+        Returns:
+            MATERIAL_GENERAL_DATA by material number in SAP internal format,
+            for the materials that could be read
+        """
+        keys = list(dict.fromkeys(key for key in map(self._material_key, material_numbers) if key))
+
+        def fetch(key: str, connection: Any) -> Optional[Dict]:
+            try:
+                result = self._call_rfc(connection, 'BAPI_MATERIAL_GET_DETAIL', MATERIAL=key)
+            except Exception as e:
+                self.logger.warning("Could not read material %s: %s", key, e)
+                return None
+            if result.get('RETURN', {}).get('TYPE') not in self.RFC_SUCCESS_TYPES:
+                return None
+            return result.get('MATERIAL_GENERAL_DATA', {})
+
+        def fetch_pooled(key: str) -> Optional[Dict]:
+            with self.rfc_pool.connection() as pooled:
+                return fetch(key, pooled)
+
+        if connection is None and self.rfc_pool:
+            with ThreadPoolExecutor(max_workers=self.rfc_pool.size, thread_name_prefix='rfc-worker') as executor:
+                details = dict(zip(keys, executor.map(fetch_pooled, keys)))
+        else:
+            connection = connection or self.rfc_connection
+            if not connection:
+                return {}
+            details = {key: fetch(key, connection) for key in keys}
+
+        return {key: detail for key, detail in details.items() if detail is not None}
+
+    def _delta_enabled(self, method: str, action: str) -> bool:
+        """Check if updates only send fields that differ from SAP ([Automation] delta_updates)"""
+        return (method == 'rfc' and action != 'validate'
+                and self.config.getboolean('Automation', 'delta_updates', fallback=False))
+
+    def _delta_fields(self, material_data: Dict, current: Dict) -> Tuple[Dict, int, int]:
+        """
+        Clear the fields of an update that already hold the value given in SAP
+
+        Args:
+            material_data: Dictionary containing material data
+            current: MATERIAL_GENERAL_DATA of the material
+
+        Returns:
+            Tuple of (delta, changed, unchanged): a copy of material_data
+            with unchanged fields set to None, and the number of changed
+            and unchanged fields
+        """
+        delta = dict(material_data)
+        changed = 0
+        unchanged = 0
+        for field, sap_field in self.DELTA_FIELDS.items():
+            value = material_data.get(field)
+            if self._is_blank(value):
+                continue
+            new = str(value).strip()
+            old = str(current.get(sap_field, '')).strip()
+            # Codes are stored in upper case; descriptions are compared as given
+            if field != 'Description':
+                new, old = new.upper(), old.upper()
+            if new == old:
+                delta[field] = None
+                unchanged += 1
+            else:
+                changed += 1
+        return delta, changed, unchanged
+
+    def _plan_records(
+        self,
+        records: List[Tuple[int, Dict]],
+        method: str,
+        action: str
+    ) -> Tuple[List[Tuple[int, Dict]], Dict[int, str]]:
+        """
+        Decide for the valid records of a chunk whether and how to post them
+
+        Applies existence routing (see _existing_routes) and, with delta
+        updates enabled, compares every update against the material's
+        current data: unchanged fields are not sent, and records without
+        any changed field are not posted at all.
+
+        Args:
+            records: (record_num, material_data) tuples of one chunk
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+
+        Returns:
+            Tuple of (posting, routes): the records with the data to post,
+            and record numbers mapped to 'skip', 'unchanged' or 'update'
+        """
+        routes = self._existing_routes(records, method, action)
+        if not self._delta_enabled(method, action):
+            return records, routes
+
+        updates = [(record_num, material_data) for record_num, material_data in records
+                   if action == 'update' or routes.get(record_num) == 'update']
+        if not updates:
+            return records, routes
+
+        details = self.fetch_material_details(material_data.get('Material_Number') for _, material_data in updates)
+        deltas = {}
+        for record_num, material_data in updates:
+            current = details.get(self._material_key(material_data.get('Material_Number')))
+            if current is None:
+                continue
+            delta, changed, unchanged = self._delta_fields(material_data, current)
+            self.delta_stats['fields'] += unchanged
+            if changed:
+                deltas[record_num] = delta
+            else:
+                routes[record_num] = 'unchanged'
+                self.delta_stats['records'] += 1
+
+        posting = [(record_num, deltas.get(record_num, material_data)) for record_num, material_data in records]
+        return posting, routes
+
+    def _assign_material_numbers(self, material_list: List[Dict], connection: Any) -> List[Dict]:
+        """
+        Draw internal material numbers for records that have none
+
+        Calls BAPI_MATERIAL_GETINTNUMBER once per material type and industry
+        sector. Records whose numbers cannot be drawn keep an empty number.
+
+        Args:
+            material_list: Material data dictionaries (left unchanged)
+            connection: RFC connection
+
+        Returns:
+            Copies of the material data dictionaries with Material_Number set
+        """
+        numbered = [dict(material_data) for material_data in material_list]
+        groups = {}
+        for material_data in numbered:
+            if self._is_blank(material_data.get('Material_Number')):
+                key = (material_data.get('Material_Type', ''), material_data.get('Industry_Sector', 'M'))
+                groups.setdefault(key, []).append(material_data)
+
+        for (material_type, sector), group in groups.items():
+            try:
+                result = self._call_rfc(
+                    connection,
+                    'BAPI_MATERIAL_GETINTNUMBER',
+                    MATERIAL_TYPE=material_type,
+                    INDUSTRY_SECTOR=sector,
+                    REQUIRED_NUMBERS=len(group)
+                )
+                numbers = [row.get('MATERIAL', '') for row in result.get('MATERIAL_NUMBER', [])]
+            except Exception as e:
+                self.logger.error("Failed to draw material numbers for type %s: %s", material_type, e)
+                numbers = []
+            for material_data, number in zip(group, numbers):
+                material_data['Material_Number'] = number
+
+        return numbered
+
+    @timed('post_batch_rfc')
+    def post_materials_batch_rfc(
+        self,
+        material_list: List[Dict],
+        action: str = 'create',
+        connection: Any = None
+    ) -> List[Tuple[bool, str]]:
+        """
+        Create or update several materials in one BAPI_MATERIAL_SAVEREPLICA call
+
+        Messages in RETURNMESSAGES are mapped back to records by their
+        MATERIAL or ROW field. A record counts as saved if it has a success
+        message, or has no message at all and the batch reported no failure
+        it could not attribute to a record. Records rejected in the batch,
+        records whose outcome is unknown and records that cannot be batched
+        because no material number could be drawn are posted again one by
+        one with BAPI_MATERIAL_SAVEDATA.
+
+        If the batch call itself fails (e.g. the connection is lost and the
+        retry policy gives up), SAP may have saved part of the batch, so its
+        records are reported as failed instead of being posted again; rerun
+        them with --resume, with existing_materials set to skip or update.
+
+        Args:
+            material_list: Material data dictionaries
+            action: 'create' or 'update'
+            connection: RFC connection to use instead of self.rfc_connection
+
+        Returns:
+            List of (success, message) tuples in the order of material_list
+        """
+        connection = connection or self.rfc_connection
+        if not connection:
+            return [(False, "RFC connection not established")] * len(material_list)
+
+        post_single = self.create_material_rfc if action == 'create' else self.update_material_rfc
+        verb = 'created' if action == 'create' else 'updated'
+        function = 'INS' if action == 'create' else 'UPD'
+        outcomes: List[Optional[Tuple[bool, str]]] = [None] * len(material_list)
+
+        numbered = material_list
+        if action == 'create':
+            numbered = self._assign_material_numbers(material_list, connection)
+
+        # Build the table parameters for every record that has a number
+        batch = [index for index, material_data in enumerate(numbered)
+                 if not self._is_blank(material_data.get('Material_Number'))]
+        head_data, client_data, client_data_x, descriptions = [], [], [], []
+        for index in batch:
+            material_data = numbered[index]
+            material = str(material_data['Material_Number'])
+            head = {'FUNCTION': function, 'MATERIAL': material, 'BASIC_VIEW': 'X'}
+            if action == 'create' or material_data.get('Industry_Sector'):
+                head['IND_SECTOR'] = material_data.get('Industry_Sector', 'M')
+            if action == 'create' or material_data.get('Material_Type'):
+                head['MATL_TYPE'] = material_data.get('Material_Type', '')
+            head_data.append(head)
+            if action == 'create' or material_data.get('Base_Unit'):
+                client_data.append({'FUNCTION': function, 'MATERIAL': material,
+                                    'BASE_UOM': material_data.get('Base_Unit', '')})
+                client_data_x.append({'FUNCTION': function, 'MATERIAL': material, 'BASE_UOM': 'X'})
+            if action == 'create' or material_data.get('Description'):
+                descriptions.append({'FUNCTION': function, 'MATERIAL': material, 'LANGU': 'EN',
+                                     'MATL_DESC': material_data.get('Description', '')})
+
+        if batch:
+            try:
+                result = self._call_rfc(
+                    connection,
+                    'BAPI_MATERIAL_SAVEREPLICA',
+                    HEADDATA=head_data,
+                    CLIENTDATA=client_data,
+                    CLIENTDATAX=client_data_x,
+                    MATERIALDESCRIPTION=descriptions
+                )
+            except Exception as e:
+                self.logger.error("Error posting material batch via RFC: %s", e)
+                if is_transient(e):
+                    # The batch may have been saved in part; posting it again could duplicate it
+                    for index in batch:
+                        outcomes[index] = (
+                            False,
+                            f"Batch call failed: {str(e)}; material {numbered[index]['Material_Number']} "
+                            f"was not posted again as SAP may have saved it"
+                        )
+                result = None
+
+            if result is not None:
+                self._map_batch_messages(result, head_data, batch, outcomes, action)
+                self.logger.info(
+                    "Batch of %s materials %s via RFC, %s accepted",
+                    len(batch), verb, sum(outcome is not None for outcome in outcomes)
+                )
+
+        # Fall back to single posting for everything the batch did not accept
+        for index, material_data in enumerate(material_list):
+            if outcomes[index] is None:
+                outcomes[index] = post_single(material_data, connection=connection)
+
+        return outcomes
+
+    def _map_batch_messages(
+        self,
+        result: Dict,
+        head_data: List[Dict],
+        batch: List[int],
+        outcomes: List[Optional[Tuple[bool, str]]],
+        action: str
+    ):
+        """
+        Mark the records a BAPI_MATERIAL_SAVEREPLICA call saved as successful
+
+        Args:
+            result: Result dictionary of the call
+            head_data: HEADDATA rows sent, one per batched record
+            batch: Index in outcomes of the record of each HEADDATA row
+            outcomes: Outcomes by record, filled in for saved records
+            action: 'create' or 'update'
+        """
+        verb = 'created' if action == 'create' else 'updated'
+
+        # Map messages back to rows by material number (which may repeat) or table row
+        rows_by_material: Dict[str, List[int]] = {}
+        for row, head in enumerate(head_data):
+            rows_by_material.setdefault(head['MATERIAL'], []).append(row)
+        saved, errors = set(), set()
+        unmatched = False
+        for message in result.get('RETURNMESSAGES', []):
+            rows = rows_by_material.get(message.get('MATERIAL'))
+            if not rows and message.get('ROW'):
+                row = int(message['ROW']) - 1
+                rows = [row] if 0 <= row < len(head_data) else None
+            if message.get('TYPE') in self.RFC_SUCCESS_TYPES:
+                saved.update(rows or ())
+            elif rows:
+                errors.update(rows)
+            else:
+                unmatched = True
+
+        # Rows without a message of their own are only known to be saved if
+        # the batch reported no failure that could belong to them
+        batch_failed = result.get('RETURN', {}).get('TYPE') not in self.RFC_SUCCESS_TYPES
+        accept_silent = not batch_failed and not unmatched
+        for row, index in enumerate(batch):
+            if row in errors or (row not in saved and not accept_silent):
+                continue
+            material = head_data[row]['MATERIAL']
+            if action == 'create':
+                self._remember_created(material)
+            outcomes[index] = (True, f"Material {material} {verb} successfully")
+    
+    def _post_material(self, material_data: Dict, method: str, action: str) -> Tuple[bool, str]:
+        """
+        Post a single validated material to SAP
+
+        Args:
+            material_data: Dictionary containing material data
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+
+        Returns:
+            Tuple of (success, message)
+        """
+        if action == 'validate':
+            return True, "Validation successful"
+        elif action == 'create':
+            if method == 'gui':
+                return self.create_material_gui(material_data)
+            return self.create_material_rfc(material_data)
+        else:  # update
+            if method == 'gui':
+                return self.update_material_gui(material_data)
+            return self.update_material_rfc(material_data)
+
+    def _post_material_pooled(self, material_data: Dict, action: str) -> Tuple[bool, str]:
+        """
+        Post a single validated material over a connection borrowed from the pool
+
+        Args:
+            material_data: Dictionary containing material data
+            action: 'create' or 'update'
+
+        Returns:
+            Tuple of (success, message)
+        """
+        with self.rfc_pool.connection(records=1) as connection:
+            if action == 'create':
+                return self.create_material_rfc(material_data, connection=connection)
+            return self.update_material_rfc(material_data, connection=connection)
+
+    def _journaled(
+        self,
+        post: Callable[[Dict], Tuple[bool, str]]
+    ) -> Callable[[Tuple[int, Dict]], Tuple[bool, str]]:
+        """
+        Wrap a posting function so each outcome is journaled as it completes
+
+        Args:
+            post: Function posting one material data dictionary
+
+        Returns:
+            Function taking a (record_num, material_data) tuple
+        """
+        def run(record: Tuple[int, Dict]) -> Tuple[bool, str]:
+            record_num, material_data = record
+            started = time.perf_counter()
+            success, message = post(material_data)
+            self.metrics.record('post', time.perf_counter() - started, record=record_num)
+            if self.journal:
+                self.journal.record(record_num, success, message)
+            return success, message
+
+        return run
+
+    def _post_routed(
+        self,
+        records: List[Tuple[int, Dict]],
+        routes: Dict[int, str],
+        action: str,
+        post: Callable[[List[Tuple[int, Dict]], str], Iterable[Tuple[bool, str]]]
+    ) -> Iterable[Tuple[bool, str]]:
+        """
+        Post records, updating instead of creating those routed to 'update'
+
+        Args:
+            records: (record_num, material_data) tuples
+            routes: Record numbers mapped to 'skip', 'unchanged' or 'update'
+            action: 'create', 'update', or 'validate'
+            post: Function posting a list of records for an action
+
+        Returns:
+            Iterable of (success, message) tuples in the order of records,
+            leaving out skipped records
+        """
+        records = [record for record in records if routes.get(record[0]) not in self.SKIP_ROUTES]
+        updates = [record for record in records if routes.get(record[0]) == 'update']
+        if not updates:
+            return post(records, action)
+
+        creates = [record for record in records if routes.get(record[0]) != 'update']
+        outcomes = dict(zip((record_num for record_num, _ in creates), post(creates, action)))
+        outcomes.update(zip((record_num for record_num, _ in updates), post(updates, 'update')))
+        return [outcomes[record_num] for record_num, _ in records]
+
+    def _post_materials(
+        self,
+        records: List[Tuple[int, Dict]],
+        method: str,
+        action: str
+    ) -> Iterator[Tuple[bool, str]]:
+        """
+        Post validated materials, in parallel when an RFC pool is open
+
+        Args:
+            records: (record_num, material_data) tuples
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+
+        Yields:
+            (success, message) tuples in the order of records, each as soon
+            as it and all records before it are done
+        """
+        batch_size = self.config.getint('RFC', 'batch_size', fallback=0)
+        if method == 'rfc' and action != 'validate' and batch_size > 1:
+            yield from self._post_materials_batched(records, action, batch_size)
+        elif method == 'rfc' and action != 'validate' and self.rfc_pool:
+            post = self._journaled(lambda material_data: self._post_material_pooled(material_data, action))
+            yield from self._post_executor.map(post, records)
+        elif method == 'gui' and action != 'validate' and self.gui_session_count > 1:
+            yield from self._post_materials_gui_sessions(records, action)
+        else:
+            post = self._journaled(lambda material_data: self._post_material(material_data, method, action))
+            yield from map(post, records)
+
+    def _post_materials_batched(
+        self,
+        records: List[Tuple[int, Dict]],
+        action: str,
+        batch_size: int
+    ) -> Iterator[Tuple[bool, str]]:
+        """
+        Post validated materials via RFC in batches of batch_size records
+
+        Batches are spread across the RFC pool when one is open.
+
+        Args:
+            records: (record_num, material_data) tuples
+            action: 'create' or 'update'
+            batch_size: Records per BAPI_MATERIAL_SAVEREPLICA call
+
+        Yields:
+            (success, message) tuples in the order of records, a batch at a
+            time as batches complete
+        """
+        def post(batch: List[Tuple[int, Dict]]) -> List[Tuple[bool, str]]:
+            return self._post_batch(batch, action)
+
+        batches = [records[start:start + batch_size] for start in range(0, len(records), batch_size)]
+        if self.rfc_pool:
+            for outcomes in self._post_executor.map(post, batches):
+                yield from outcomes
+        else:
+            for batch in batches:
+                yield from post(batch)
+
+    def _post_batch(self, batch: List[Tuple[int, Dict]], action: str) -> List[Tuple[bool, str]]:
+        """
+        Post one RFC batch, over a pooled connection if a pool is open, and journal it
+
+        Args:
+            batch: (record_num, material_data) tuples
+            action: 'create' or 'update'
+
+        Returns:
+            List of (success, message) tuples in the order of batch
+        """
+        material_list = [material_data for _, material_data in batch]
+        started = time.perf_counter()
+        if self.rfc_pool:
+            with self.rfc_pool.connection(records=len(batch)) as connection:
+                outcomes = self.post_materials_batch_rfc(material_list, action, connection)
+        else:
+            outcomes = self.post_materials_batch_rfc(material_list, action)
+        self.metrics.record('post', time.perf_counter() - started, records=f"{batch[0][0]}-{batch[-1][0]}")
+        if self.journal:
+            for (record_num, _), (success, message) in zip(batch, outcomes):
+                self.journal.record(record_num, success, message)
+        return outcomes
+
+    def _post_materials_gui_sessions(
+        self,
+        records: List[Tuple[int, Dict]],
+        action: str
+    ) -> Iterator[Tuple[bool, str]]:
+        """
+        Post validated materials with the run's worker threads, one per
+        SAP GUI session
+
+        Args:
+            records: (record_num, material_data) tuples
+            action: 'create' or 'update'
+
+        Yields:
+            (success, message) tuples in the order of records
+        """
+        post = self._journaled(lambda material_data: self._gui_post(material_data, action))
+        yield from self._post_executor.map(post, records)
+
+    def _gui_session_executor(self) -> Tuple[ThreadPoolExecutor, Callable[[Dict, str], Tuple[bool, str]]]:
+        """
+        Create a thread pool with one worker bound to each SAP GUI session
+
+        Returns:
+            Tuple of (executor, post) where post(material_data, action)
+            creates or updates one material on the session of the worker
+            thread running it
+        """
+        slots = itertools.count()
+        worker = threading.local()
+
+        def attach():
+            with self._stats_lock:
+                worker.slot = next(slots)
+            threading.current_thread().name = f"GUI session {worker.slot}"
+            worker.session = self._attach_gui_session(worker.slot)
+
+        def post(material_data: Dict, action: str) -> Tuple[bool, str]:
+            started = time.perf_counter()
+            if action == 'create':
+                outcome = self.create_material_gui(material_data, session=worker.session)
+            else:
+                outcome = self.update_material_gui(material_data, session=worker.session)
+            with self._stats_lock:
+                stats = self.gui_session_stats[worker.slot]
+                stats['calls'] += 1
+                stats['busy_seconds'] += time.perf_counter() - started
+            return outcome
+
+        executor = ThreadPoolExecutor(max_workers=self.gui_session_count, initializer=attach)
+        return executor, post
+
+    def _process_chunk(
+        self,
+        df: pd.DataFrame,
+        method: str,
+        action: str,
+        total: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Validate and post one chunk of material records
+
+        Args:
+            df: DataFrame with material data
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+            total: Total number of records in the run, if known
+
+        Yields:
+            Result dictionaries in record order, each as soon as it is known
+        """
+        # Validate all records of the chunk with column-wise rules
+        _, validation_errors = self.validate_dataframe(df, action)
+
+        records = list(zip(df.index, df.to_dict('records')))
+        valid = [(idx + 1, material_data) for idx, material_data in records if idx not in validation_errors]
+        posting, routes = self._plan_records(valid, method, action)
+        outcomes = iter(self._post_routed(
+            posting,
+            routes,
+            action,
+            lambda records, action: self._post_materials(records, method, action)
+        ))
+
+        for idx, material_data in records:
+            record_num = idx + 1
+
+            self._log_progress(record_num, total)
+
+            errors = validation_errors.get(idx)
+            if errors:
+                yield self._validation_failed_result(record_num, material_data, errors)
+                continue
+            if routes.get(record_num) in self.SKIP_ROUTES:
+                yield self._skipped_result(record_num, material_data, routes[record_num])
+                continue
+
+            success, message = next(outcomes)
+
+            yield {
+                'record': record_num,
+                'status': 'success' if success else 'failed',
+                'message': message,
+                'data': material_data
+            }
+
+    def _validation_failed_result(self, record_num: int, material_data: Dict, errors: List[str]) -> Dict:
+        """Build and journal the result of a record that failed validation"""
+        result = {
+            'record': record_num,
+            'status': 'failed',
+            'message': f"Validation failed: {'; '.join(errors)}",
+            'data': material_data
+        }
+        self.logger.warning("Record %s validation failed: %s", record_num, errors)
+        if self.journal:
+            self.journal.record(record_num, False, result['message'])
+        return result
+
+    def _skipped_result(self, record_num: int, material_data: Dict, route: str) -> Dict:
+        """Build and journal the result of a record not posted because of its route (see SKIP_ROUTES)"""
+        material_number = material_data.get('Material_Number')
+        if route == 'unchecked':
+            result = {
+                'record': record_num,
+                'status': 'failed',
+                'message': f"Could not check whether material {material_number} exists; not posted",
+                'data': material_data
+            }
+            self.logger.warning("Record %s failed: %s", record_num, result['message'])
+            if self.journal:
+                self.journal.record(record_num, False, result['message'])
+            return result
+
+        reason = 'already exists' if route == 'skip' else 'is unchanged'
+        result = {
+            'record': record_num,
+            'status': 'skipped',
+            'message': f"Material {material_number} {reason}",
+            'data': material_data
+        }
+        self.logger.debug("Record %s skipped: %s", record_num, result['message'])
+        if self.journal:
+            self.journal.record(record_num, True, result['message'])
+        return result
+
+    def process_materials(
+        self,
+        file_path: str,
+        method: str = 'gui',
+        action: str = 'create',
+        chunksize: Optional[int] = None,
+        resume: bool = False,
+        keep_results: bool = True
+    ) -> Dict:
+        """
+        Process materials from input file
+
+        Result rows are appended to logs/results_<timestamp>.<format> as
+        records complete ([Automation] results_format csv, jsonl or parquet).
+
+        For create and update, every record outcome is appended to the
+        journal configured by [Automation] journal_file (empty to disable),
+        keyed by the input file's hash, the action and the record number.
+
+        Args:
+            file_path: Path to input CSV, Excel, Parquet or Feather file
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+            chunksize: Number of records to read, validate and post at a
+                time; defaults to [Automation] chunk_size (0 reads the whole
+                file at once)
+            resume: Skip records the journal shows as already successful
+                for this file and action
+            keep_results: Also collect every result in summary['results'];
+                disable for large runs to keep only counters in memory
+
+        Returns:
+            Dictionary with processing results
+        """
+        self.logger.info(
+            "Starting material processing from %s using %s method (%s)", file_path, method, action
+        )
+
+        error, chunks, total, committed = self._prepare_run(file_path, method, action, chunksize, resume)
+        if error:
+            return error
+
+        # Process materials chunk by chunk, streaming results to disk
+        writer = self._open_results_writer()
+        results = []
+        counts = {'success': 0, 'failed': 0, 'skipped': 0}
+        status = 'completed'
+        message = None
+
+        try:
+            iterator = iter(chunks)
+            while True:
+                try:
+                    chunk = next(iterator, None)
+                except Exception as e:
+                    # A later chunk could not be read; keep what was processed so far
+                    status = 'error'
+                    message = f"Failed to read input file: {str(e)}"
+                    self.logger.error(message)
+                    break
+                if chunk is None:
+                    break
+                chunk = self._skip_committed(chunk, committed, counts)
+                for result in self._process_chunk(chunk, method, action, total):
+                    self._record_result(result, writer, results if keep_results else None, counts)
+        except Exception as e:
+            # Posting or writing results failed; keep what was processed so far
+            status = 'error'
+            message = f"Processing failed: {str(e)}"
+            self.logger.error(message)
+        finally:
+            self._close_run(writer)
+
+        return self._finish_run(status, message, counts, results, writer)
+
+    async def process_materials_async(
+        self,
+        file_path: str,
+        method: str = 'gui',
+        action: str = 'create',
+        chunksize: Optional[int] = None,
+        resume: bool = False,
+        keep_results: bool = True,
+        queue_size: Optional[int] = None
+    ) -> Dict:
+        """
+        Process materials from input file as a staged asyncio pipeline
+
+        A reader, a validator, one poster per SAP worker (RFC pool
+        connection or GUI session) and a result sink run concurrently,
+        connected by bounded queues. Blocking reads, validation and SAP
+        calls run in executors, so the next records are read and validated
+        while earlier ones are being posted, and a slow SAP system holds
+        back reading instead of filling memory. Results are written in
+        record order; journaling and the summary are the same as for
+        process_materials.
+
+        Args:
+            file_path: Path to input CSV, Excel, Parquet or Feather file
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+            chunksize: Number of records to read and validate at a time;
+                defaults to [Automation] chunk_size
+            resume: Skip records the journal shows as already successful
+                for this file and action
+            keep_results: Also collect every result in summary['results']
+            queue_size: Capacity of each queue between stages; defaults to
+                [Automation] queue_size
+
+        Returns:
+            Dictionary with processing results
+        """
+        self.logger.info(
+            "Starting pipelined material processing from %s using %s method (%s)", file_path, method, action
+        )
+
+        if queue_size is None:
+            queue_size = self.config.getint('Automation', 'queue_size', fallback=8)
+        queue_size = max(1, queue_size)
+
+        # Connect on the event loop thread, like process_materials does
+        error, chunks, total, committed = self._prepare_run(file_path, method, action, chunksize, resume)
+        if error:
+            return error
+
+        loop = asyncio.get_running_loop()
+        post_group, post_executor, posters = self._pipeline_poster(method, action)
+        # Reading and validation share one thread, leaving posting threads to SAP
+        cpu_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='read-validate')
+        chunk_queue = asyncio.Queue(maxsize=queue_size)
+        work_queue = asyncio.Queue(maxsize=queue_size)
+        done_queue = asyncio.Queue(maxsize=queue_size)
+
+        writer = self._open_results_writer()
+        results = []
+        counts = {'success': 0, 'failed': 0, 'skipped': 0}
+        status = 'completed'
+        message = None
+
+        async def read():
+            iterator = iter(chunks)
+            while True:
+                chunk = await loop.run_in_executor(cpu_executor, next, iterator, None)
+                if chunk is None:
+                    break
+                await chunk_queue.put(self._skip_committed(chunk, committed, counts))
+            await chunk_queue.put(None)
+
+        async def validate():
+            # Records are grouped so that each group holds one posting unit
+            group_size = self._pipeline_group_size(method, action)
+            seq = itertools.count()
+            while (chunk := await chunk_queue.get()) is not None:
+                _, validation_errors = await loop.run_in_executor(
+                    cpu_executor, self.validate_dataframe, chunk, action
+                )
+                records = list(zip(chunk.index + 1, chunk.to_dict('records')))
+                posting = [(record_num, material_data) for record_num, material_data in records
+                           if record_num - 1 not in validation_errors]
+                routes = {}
+                if self._existence_mode(method, action) or self._delta_enabled(method, action):
+                    posting, routes = await loop.run_in_executor(
+                        post_executor, self._plan_records, posting, method, action
+                    )
+                posting = dict(posting)
+                group = []
+                valid = 0
+                for record_num, material_data in records:
+                    errors = validation_errors.get(record_num - 1)
+                    route = routes.get(record_num)
+                    group.append((record_num, material_data, posting.get(record_num), errors, route))
+                    if not errors and route not in self.SKIP_ROUTES:
+                        valid += 1
+                    if valid == group_size:
+                        await work_queue.put((next(seq), group))
+                        group = []
+                        valid = 0
+                if group:
+                    await work_queue.put((next(seq), group))
+            for _ in range(posters):
+                await work_queue.put(None)
+
+        async def post():
+            while (item := await work_queue.get()) is not None:
+                seq, group = item
+                records = [(record_num, post_data) for record_num, _, post_data, errors, _ in group if not errors]
+                routes = {record_num: route for record_num, _, _, _, route in group if route}
+                outcomes = iter(
+                    await loop.run_in_executor(
+                        post_executor, self._post_routed, records, routes, action, post_group
+                    ) if records else []
+                )
+                group_results = []
+                for record_num, material_data, _, errors, route in group:
+                    if errors:
+                        result = self._validation_failed_result(record_num, material_data, errors)
+                    elif route in self.SKIP_ROUTES:
+                        result = self._skipped_result(record_num, material_data, route)
+                    else:
+                        success, outcome_message = next(outcomes)
+                        result = {
+                            'record': record_num,
+                            'status': 'success' if success else 'failed',
+                            'message': outcome_message,
+                            'data': material_data
+                        }
+                    group_results.append(result)
+                await done_queue.put((seq, group_results))
+            await done_queue.put(None)
+
+        async def sink():
+            # Posters finish out of order; hold groups back until their turn
+            pending = {}
+            expected = 0
+            finished = 0
+            while finished < posters:
+                item = await done_queue.get()
+                if item is None:
+                    finished += 1
+                    continue
+                seq, group_results = item
+                pending[seq] = group_results
+                while expected in pending:
+                    for result in pending.pop(expected):
+                        self._log_progress(result['record'], total)
+                        self._record_result(result, writer, results if keep_results else None, counts)
+                    expected += 1
+
+        tasks = [
+            asyncio.create_task(read()),
+            asyncio.create_task(validate()),
+            *(asyncio.create_task(post()) for _ in range(posters)),
+            asyncio.create_task(sink())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            # Stop the other stages; results already written are kept
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            status = 'error'
+            message = f"Pipeline failed: {str(e)}"
+            self.logger.error(message)
+        finally:
+            cpu_executor.shutdown(wait=True)
+            post_executor.shutdown(wait=True)
+            self._close_run(writer)
+
+        return self._finish_run(status, message, counts, results, writer)
+
+    def _pipeline_group_size(self, method: str, action: str) -> int:
+        """Number of valid records posted together by one pipeline poster"""
+        batch_size = self.config.getint('RFC', 'batch_size', fallback=0)
+        if method == 'rfc' and action != 'validate' and batch_size > 1:
+            return batch_size
+        return 1
+
+    def _pipeline_poster(
+        self,
+        method: str,
+        action: str
+    ) -> Tuple[Callable[[List[Tuple[int, Dict]], str], List[Tuple[bool, str]]], ThreadPoolExecutor, int]:
+        """
+        Choose how pipeline posters send a group of validated records to SAP
+
+        Args:
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+
+        Returns:
+            Tuple of (post_group, executor, posters): post_group(records,
+            action) posts a list of (record_num, material_data) tuples and
+            journals the outcomes, executor runs it, and posters is the
+            number of groups to keep in flight
+        """
+        if action == 'validate':
+            return (
+                lambda records, action: [(True, "Validation successful")] * len(records),
+                ThreadPoolExecutor(max_workers=1),
+                1
+            )
+
+        if method == 'gui':
+            executor, post = self._post_executor, self._gui_post
+            if executor is None:
+                executor, post = self._gui_session_executor()
+
+            def post_gui(records: List[Tuple[int, Dict]], action: str) -> List[Tuple[bool, str]]:
+                journaled = self._journaled(lambda material_data: post(material_data, action))
+                return [journaled(record) for record in records]
+
+            return post_gui, executor, self.gui_session_count
+
+        def post_rfc(records: List[Tuple[int, Dict]], action: str) -> List[Tuple[bool, str]]:
+            if self.rfc_pool:
+                journaled = self._journaled(lambda material_data: self._post_material_pooled(material_data, action))
+            else:
+                journaled = self._journaled(lambda material_data: self._post_material(material_data, method, action))
+            return [journaled(record) for record in records]
+
+        workers = self.rfc_pool.size if self.rfc_pool else 1
+        executor = self._post_executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='rfc-worker')
+        if self._pipeline_group_size(method, action) > 1:
+            return self._post_batch, executor, workers
+        return post_rfc, executor, workers
+
+    def validate_file_parallel(
+        self,
+        file_path: str,
+        workers: int,
+        action: str = 'validate',
+        keep_results: bool = True,
+        chunksize: Optional[int] = None
+    ) -> Dict:
+        """
+        Validate an input file on several CPU cores
+
+        CSV files without quoted fields are split into byte ranges that each
+        worker process parses itself; other files are read in chunks of
+        chunksize records and handed to the workers. Per-shard errors are merged back in file order, so record
+        numbers match those of process_materials.
+
+        Only invalid records are reported in summary['results'] and the
+        results file; valid records are counted as successful.
+
+        Args:
+            file_path: Path to input CSV, Excel, Parquet or Feather file
+            workers: Number of worker processes
+            action: Rule set to apply: 'create', 'update', or 'validate'
+            keep_results: Also collect the failures in summary['results']
+            chunksize: Records per chunk for files that are not split into
+                byte ranges; defaults to [Automation] chunk_size (50000 if
+                unset)
+
+        Returns:
+            Dictionary with validation results
+        """
+        self.logger.info("Validating %s with %s worker processes", file_path, workers)
+        self.metrics.reset()
+
+        try:
+            shards = self._validation_shards(file_path, workers, chunksize)
+        except Exception as e:
+            return self._error_summary(f"Failed to read input file: {str(e)}")
+
+        writer = self._open_results_writer()
+        results = []
+        counts = {'success': 0, 'failed': 0, 'skipped': 0}
+        status = 'completed'
+        message = None
+        offset = 0
+
+        def merge(rows: int, failures: List[Tuple[int, List[str], Dict]]):
+            nonlocal offset
+            for position, errors, material_data in failures:
+                result = {
+                    'record': offset + position + 1,
+                    'status': 'failed',
+                    'message': f"Validation failed: {'; '.join(errors)}",
+                    'data': material_data
+                }
+                self._record_result(result, writer, results if keep_results else None, counts)
+            counts['success'] += rows - len(failures)
+            offset += rows
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Keep a few shards per worker in flight and merge in order
+                pending = deque()
+                for shard in shards:
+                    pending.append(executor.submit(_validate_shard, self.config_file, action, shard))
+                    if len(pending) >= 2 * workers:
+                        merge(*pending.popleft().result())
+                while pending:
+                    merge(*pending.popleft().result())
+        except Exception as e:
+            status = 'error'
+            message = f"Validation failed: {str(e)}"
+            self.logger.error(message)
+        finally:
+            self._close_run(writer)
+
+        return self._finish_run(status, message, counts, results, writer)
+
+    def _validation_shards(
+        self,
+        file_path: str,
+        workers: int,
+        chunksize: Optional[int] = None
+    ) -> Iterable[Union[pd.DataFrame, Tuple[str, bytes, int, int]]]:
+        """
+        Split an input file into shards for validate_file_parallel
+
+        Args:
+            file_path: Path to input CSV, Excel, Parquet or Feather file
+            workers: Number of worker processes
+            chunksize: Records per DataFrame shard, or None for
+                [Automation] chunk_size
+
+        Returns:
+            Iterable of CSV byte ranges or DataFrames, in file order
+        """
+        if file_path.endswith('.csv') and csv_is_shardable(file_path):
+            # A few ranges per worker balance uneven shards, but not below 1 MB each
+            count = max(1, min(4 * workers, os.path.getsize(file_path) >> 20))
+            header, ranges = csv_byte_ranges(file_path, count)
+            return [(file_path, header, start, end) for start, end in ranges]
+
+        if not chunksize:
+            chunksize = self.config.getint('Automation', 'chunk_size', fallback=0) or 50000
+        return self.read_input_file(file_path, chunksize=chunksize)
+
+    def _error_summary(self, message: str, total: int = 0) -> Dict:
+        """Build the summary of a run that could not start"""
+        return {
+            'status': 'error',
+            'message': message,
+            'total': total,
+            'success': 0,
+            'failed': 0,
+            'results': []
+        }
+
+    def _prepare_run(
+        self,
+        file_path: str,
+        method: str,
+        action: str,
+        chunksize: Optional[int],
+        resume: bool
+    ) -> Tuple[Optional[Dict], Iterable[pd.DataFrame], Optional[int], Set[int]]:
+        """
+        Open the input file, connect to SAP and open the journal for a run
+
+        Args:
+            file_path: Path to input CSV, Excel, Parquet or Feather file
+            method: 'gui' for SAP GUI scripting or 'rfc' for RFC API
+            action: 'create', 'update', or 'validate'
+            chunksize: Records per chunk, or None for [Automation] chunk_size
+            resume: Skip records already committed according to the journal
+
+        Returns:
+            Tuple of (error, chunks, total, committed): error is an error
+            summary if the run cannot start, chunks the input DataFrames,
+            total the record count if known, and committed the record
+            numbers to skip
+        """
+        if chunksize is None:
+            chunksize = self.config.getint('Automation', 'chunk_size', fallback=0)
+        self.delta_stats = {'records': 0, 'fields': 0}
+        self.retry_policy = self._create_retry_policy()
+        self._progress_logged = time.monotonic()
+        self.metrics.reset()
+        for connection in self.rfc_connections:
+            connection.reconnects = 0
         
-        # Save results to file
-        self._save_results(summary)
+        # Read input file
+        try:
+            if chunksize:
+                chunks = self.metrics.timed_iter('read', self.read_input_file(file_path, chunksize=chunksize))
+                total = None
+            else:
+                with self.metrics.time('read'):
+                    df = self.read_input_file(file_path)
+                chunks = [df]
+                total = len(df)
+        except Exception as e:
+            return self._error_summary(f"Failed to read input file: {str(e)}"), [], None, set()
+        
+        # Connect to SAP (skip if only validating)
+        if action != 'validate':
+            if method == 'gui':
+                if not self.connect_sap_gui():
+                    return self._error_summary('Failed to connect to SAP GUI', total or 0), [], None, set()
+            elif method == 'rfc':
+                if not self.connect_rfc():
+                    return self._error_summary('Failed to connect via RFC', total or 0), [], None, set()
+        if self.rfc_pool:
+            # Pool throughput is measured per run
+            self.rfc_pool.reset_stats()
+        
+        # Open the checkpoint journal (validation posts nothing, so it is not journaled)
+        committed = set()
+        journal_file = self.config.get('Automation', 'journal_file', fallback='logs/journal.sqlite')
+        if journal_file and action != 'validate':
+            self.journal = RunJournal(journal_file, RunJournal.hash_file(file_path), action)
+            if resume:
+                committed = self.journal.committed_records()
+                self.logger.info("Resuming: skipping %s records already committed", len(committed))
+        elif resume:
+            self.logger.warning("Cannot resume: journal disabled for this run")
+
+        # Start the posting threads once per run rather than per chunk; GUI
+        # workers attach to their sessions when they start
+        if action != 'validate':
+            if method == 'rfc' and self.rfc_pool:
+                self._post_executor = ThreadPoolExecutor(
+                    max_workers=self.rfc_pool.size, thread_name_prefix='rfc-worker'
+                )
+            elif method == 'gui' and self.gui_session_count > 1:
+                self._post_executor, self._gui_post = self._gui_session_executor()
+
+        return None, chunks, total, committed
+
+    @staticmethod
+    def _skip_committed(chunk: pd.DataFrame, committed: Set[int], counts: Dict) -> pd.DataFrame:
+        """Drop records of a chunk that were already committed, counting them as skipped"""
+        if not committed:
+            return chunk
+        done = (chunk.index + 1).isin(committed)
+        counts['skipped'] += int(done.sum())
+        return chunk[~done]
+
+    def _record_result(
+        self,
+        result: Dict,
+        writer: Optional[ResultsWriter],
+        results: Optional[List[Dict]],
+        counts: Dict
+    ):
+        """Write a record's result, keep it if requested and count it"""
+        if writer:
+            started = time.perf_counter()
+            writer.write(result)
+            self.metrics.record('save', time.perf_counter() - started, record=result['record'])
+        if results is not None:
+            results.append(result)
+        if result['status'] in ('success', 'skipped'):
+            counts[result['status']] += 1
+        else:
+            counts['failed'] += 1
+        self._write_metrics(final=False)
+
+    def _write_metrics(self, final: bool = True):
+        """
+        Export the stage metrics to [Metrics] file
+
+        Args:
+            final: Write now; otherwise only if [Metrics] interval seconds
+                have passed since the last export (metrics_interval)
+        """
+        if not self.metrics_file:
+            return
+        now = time.monotonic()
+        if not final and now - self._metrics_written < self.metrics_interval:
+            return
+        self._metrics_written = now
+        try:
+            self.metrics.write(self.metrics_file)
+            if final:
+                self.logger.info("Metrics written to %s", self.metrics_file)
+        except Exception as e:
+            self.logger.warning("Could not write metrics file %s: %s", self.metrics_file, e)
+
+    def _close_run(self, writer: Optional[ResultsWriter]):
+        """Stop the run's posting threads and close its journal and results file"""
+        if self._post_executor:
+            self._post_executor.shutdown(wait=True)
+            self._post_executor = None
+            self._gui_post = None
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if writer:
+            with self.metrics.time('save'):
+                writer.close()
+            self.logger.info("Results saved to %s", writer.output_file)
+
+    def _finish_run(
+        self,
+        status: str,
+        message: Optional[str],
+        counts: Dict,
+        results: List[Dict],
+        writer: Optional[ResultsWriter]
+    ) -> Dict:
+        """Build and log the summary of a finished run"""
+        summary = {
+            'status': status,
+            'total': counts['success'] + counts['failed'] + counts['skipped'],
+            'success': counts['success'],
+            'failed': counts['failed'],
+            'skipped': counts['skipped'],
+            'results': results,
+            'timestamp': datetime.now().isoformat()
+        }
+        if message:
+            summary['message'] = message
+        if writer:
+            summary['results_file'] = writer.output_file
+        if self.config.getboolean('Automation', 'delta_updates', fallback=False):
+            summary['delta'] = dict(self.delta_stats)
+        if self.gui_session_count > 1:
+            summary['sessions'] = [dict(entry) for entry in self.gui_session_stats]
+        summary['metrics'] = self.metrics.snapshot()
+        self._write_metrics()
+        retry_stats = self.retry_policy.stats()
+        retry_stats['reconnects'] = sum(connection.reconnects for connection in self.rfc_connections)
+        if retry_stats['retries'] or retry_stats['breaker_opened'] or retry_stats['reconnects']:
+            summary['retries'] = retry_stats
+            self.logger.info(
+                "RFC retries: %s, reconnects: %s, circuit breaker opened %s times (%.1fs paused)",
+                retry_stats['retries'], retry_stats['reconnects'],
+                retry_stats['breaker_opened'], retry_stats['paused_seconds']
+            )
+        if self.rfc_pool:
+            summary['connections'] = self.rfc_pool.stats()
+            for entry in summary['connections']:
+                self.logger.info(
+                    "RFC connection %s: %s records posted (%.1f/s), busy %.0f%% of the run",
+                    entry['connection'], entry['records'], entry['records_per_second'],
+                    entry['utilization'] * 100
+                )
+        
+        self.logger.info(
+            "Processing completed. Success: %s, Failed: %s", counts['success'], counts['failed']
+        )
         
         return summary
     
-    def _save_results(self, summary: Dict):
-        """Save processing results to file"""
+    def _open_results_writer(self) -> Optional[ResultsWriter]:
+        """Open the incremental results file for a run"""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = f"logs/results_{timestamp}.csv"
+        results_format = self.config.get('Automation', 'results_format', fallback='csv')
+        output_file = f"logs/results_{timestamp}.{results_format}"
         
         try:
-            results_df = pd.DataFrame(summary['results'])
-            results_df.to_csv(output_file, index=False)
-            self.logger.info(f"Results saved to {output_file}")
+            return ResultsWriter(
+                output_file,
+                include_data=self.config.getboolean('Automation', 'results_include_data', fallback=True),
+                flush_every=self.config.getint('Automation', 'results_flush_every', fallback=100)
+            )
         except Exception as e:
-            self.logger.error(f"Failed to save results: {str(e)}")
+            self.logger.error("Failed to open results file: %s", e)
+            return None
     
     def disconnect(self):
         """Disconnect from SAP"""
         if self.sap_session:
             self.logger.info("Disconnecting from SAP GUI")
             self.sap_session = None
+            self.gui_session_count = 1
         
         if self.rfc_connection:
             self.logger.info("Closing RFC connection")
             self.rfc_connection.close()
             self.rfc_connection = None
 
+        if self.rfc_pool:
+            self.logger.info("Closing RFC connection pool")
+            self.rfc_pool.close()
+            self.rfc_pool = None
+        self.rfc_connections = []
+
 
 def main():
     """Main entry point"""
     import argparse
     
     parser = argparse.ArgumentParser(description='SAP Material Master Automation Tool')
-    parser.add_argument('input_file', help='Path to input CSV or Excel file')
+    parser.add_argument('input_file', help='Path to input CSV, Excel, Parquet or Feather file')
     parser.add_argument('--method', choices=['gui', 'rfc'], default='gui',
                        help='Method to use: gui (SAP GUI scripting) or rfc (RFC API)')
     parser.add_argument(
@@ -646,19 +2575,58 @@ def main():
     )
     parser.add_argument('--config', default='config.ini',
                        help='Path to configuration file')
+    parser.add_argument('--chunksize', type=int, default=None,
+                       help='Stream the input file in chunks of N records')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip records already committed by an earlier run of the same file')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='Overlap reading, validation and posting in an asyncio pipeline')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Validate with N worker processes (--action validate only)')
+    parser.add_argument('--profile', nargs='?', const='', metavar='PREFIX',
+                       help='Profile the run, writing PREFIX.pstats and PREFIX.collapsed '
+                            '(default logs/profile_<timestamp>)')
+    parser.add_argument('--trace', metavar='FILE',
+                       help='Write a timeline of the run in Chrome trace event format to FILE')
     
     args = parser.parse_args()
+    if args.workers > 1:
+        if args.action != 'validate':
+            parser.error('--workers is only supported with --action validate')
+        for flag, given in (('--async', args.use_async), ('--resume', args.resume),
+                            ('--profile', args.profile is not None)):
+            if given:
+                parser.error(f'{flag} cannot be combined with --workers')
     
     # Create automation instance
     automation = MaterialMasterAutomation(config_file=args.config)
+    if args.trace:
+        automation.metrics.tracer = TraceRecorder()
     
     try:
         # Process materials
-        summary = automation.process_materials(
-            args.input_file,
+        options = dict(
             method=args.method,
-            action=args.action
+            action=args.action,
+            chunksize=args.chunksize,
+            resume=args.resume,
+            keep_results=False
         )
+        if args.workers > 1:
+            run = lambda: automation.validate_file_parallel(
+                args.input_file, args.workers, keep_results=False, chunksize=args.chunksize
+            )
+        elif args.use_async:
+            run = lambda: asyncio.run(automation.process_materials_async(args.input_file, **options))
+        else:
+            run = lambda: automation.process_materials(args.input_file, **options)
+        
+        profiler = None
+        if args.profile is not None:
+            profiler = RunProfiler()
+            summary = profiler.run(run)
+        else:
+            summary = run()
         
         # Print summary
         print("\n" + "="*50)
@@ -667,9 +2635,24 @@ def main():
         print(f"Total Records: {summary['total']}")
         print(f"Successful: {summary['success']}")
         print(f"Failed: {summary['failed']}")
+        if summary.get('skipped'):
+            print(f"Skipped (already committed, existing or unchanged): {summary['skipped']}")
+        if summary.get('retries'):
+            print(f"Retries: {summary['retries']['retries']}, "
+                  f"reconnects: {summary['retries']['reconnects']} "
+                  f"(circuit breaker opened {summary['retries']['breaker_opened']} times)")
+        if summary.get('delta'):
+            print(f"Delta: {summary['delta']['records']} unchanged records, "
+                  f"{summary['delta']['fields']} unchanged fields not sent")
         print(f"Status: {summary['status']}")
         print("="*50)
         
+        if profiler:
+            prefix = args.profile or f"logs/profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            stats_file, collapsed_file = profiler.write(prefix)
+            print(f"\n{profiler.report()}")
+            print(f"Profile written to {stats_file} and {collapsed_file}")
+        
         # Exit with appropriate code
         sys.exit(0 if summary['failed'] == 0 else 1)
         
@@ -681,6 +2664,12 @@ def main():
         sys.exit(1)
     finally:
         automation.disconnect()
+        if args.trace:
+            try:
+                automation.metrics.tracer.write(args.trace)
+                print(f"Trace written to {args.trace}")
+            except OSError as e:
+                print(f"Could not write trace {args.trace}: {str(e)}")
 
 
 if __name__ == '__main__':
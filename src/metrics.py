@@ -0,0 +1,196 @@
+"""
+Per-stage timing metrics with latency percentiles, exported as Prometheus
+text format or JSON
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class StageMetrics:
+    """Count calls and sample durations per processing stage"""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, sample_size: int = 10000, prefix: str = 'material_master'):
+        """
+        Create empty metrics
+
+        Args:
+            sample_size: Durations kept per stage for percentiles; longer
+                runs keep a uniform random sample of this size
+            prefix: Prefix of the exported metric names
+        """
+        self.sample_size = sample_size
+        self.prefix = prefix
+        self._stages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(0)
+        # TraceRecorder receiving every call as a span, if tracing
+        self.tracer = None
+
+    def record(self, stage: str, seconds: float, track: Optional[str] = None, **details: Any):
+        """
+        Record one completed call of a stage
+
+        Args:
+            stage: Stage name, e.g. 'read' or 'create_rfc'
+            seconds: Duration of the call, which has just ended
+            track: Trace timeline row of the call (default: current thread)
+            details: Span details for the trace, e.g. record=12
+        """
+        if self.tracer is not None:
+            self.tracer.add(stage, seconds, track, **details)
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {'count': 0, 'sum': 0.0, 'max': 0.0, 'samples': []}
+            count = entry['count'] = entry['count'] + 1
+            entry['sum'] += seconds
+            if seconds > entry['max']:
+                entry['max'] = seconds
+            if count <= self.sample_size:
+                entry['samples'].append(seconds)
+            else:
+                # Reservoir sampling keeps every call equally likely to be kept
+                slot = int(self._random.random() * count)
+                if slot < self.sample_size:
+                    entry['samples'][slot] = seconds
+
+    def time(self, stage: str) -> '_Timer':
+        """Time the body of a with-block as one call of a stage"""
+        return _Timer(self, stage)
+
+    def timed_iter(self, stage: str, items: Iterable) -> Iterator:
+        """Yield from items, timing each step of the iteration as one call of a stage"""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(stage, time.perf_counter() - started)
+            yield item
+
+    def reset(self):
+        """Forget all recorded calls"""
+        with self._lock:
+            self._stages = {}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Summarize the recorded calls
+
+        Returns:
+            Dictionary by stage with count, total_seconds, max_seconds and
+            p50/p95/p99 in seconds
+        """
+        with self._lock:
+            stages = {stage: dict(entry, samples=sorted(entry['samples'])) for stage, entry in self._stages.items()}
+
+        summary = {}
+        for stage, entry in sorted(stages.items()):
+            summary[stage] = {
+                'count': entry['count'],
+                'total_seconds': round(entry['sum'], 6),
+                'max_seconds': round(entry['max'], 6)
+            }
+            for quantile in self.QUANTILES:
+                summary[stage][f'p{round(quantile * 100)}'] = round(self._quantile(entry['samples'], quantile), 6)
+        return summary
+
+    @staticmethod
+    def _quantile(samples: List[float], quantile: float) -> float:
+        # Nearest-rank percentile of sorted samples
+        if not samples:
+            return 0.0
+        rank = max(1, int(quantile * len(samples) + 0.999999))
+        return samples[min(rank, len(samples)) - 1]
+
+    def to_prometheus(self) -> str:
+        """
+        Render the metrics in Prometheus text exposition format
+
+        Returns:
+            One summary metric, <prefix>_stage_seconds, labelled by stage
+        """
+        name = f'{self.prefix}_stage_seconds'
+        lines = [
+            f'# HELP {name} Time spent per call of each processing stage',
+            f'# TYPE {name} summary'
+        ]
+        for stage, entry in self.snapshot().items():
+            for quantile in self.QUANTILES:
+                value = entry[f'p{round(quantile * 100)}']
+                lines.append(f'{name}{{stage="{stage}",quantile="{quantile}"}} {value}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {entry["total_seconds"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {entry["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        Write the metrics to a file, replacing it atomically
+
+        Args:
+            path: Output file; .json files get JSON, others Prometheus text
+                (e.g. a .prom file for node_exporter's textfile collector)
+        """
+        if path.endswith('.json'):
+            content = json.dumps({'updated': time.time(), 'stages': self.snapshot()}, indent=2)
+        else:
+            content = self.to_prometheus()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temporary, path)
+
+
+class _Timer:
+    """Context manager recording the duration of its block"""
+
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics: StageMetrics, stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any):
+        self.metrics.record(self.stage, time.perf_counter() - self.started)
+
+
+def timed(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Decorate a method so each call is recorded in self.metrics under stage
+
+    Args:
+        stage: Stage name
+
+    Returns:
+        Method decorator
+    """
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            metrics: Optional[StageMetrics] = getattr(self, 'metrics', None)
+            if metrics is None:
+                return method(self, *args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.record(stage, time.perf_counter() - started)
+        return wrapper
+    return decorate
@@ -0,0 +1,329 @@
+"""
+Profiling of processing runs: cProfile statistics, collapsed stacks for
+flame graph tools and hot functions grouped by subsystem
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# pstats key of a function: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+# 'waiting' is time threads spend blocked on locks and queues, e.g. a
+# worker waiting for its next record or the main thread for the workers
+SUBSYSTEMS = ('I/O', 'validation', 'backend call', 'logging', 'waiting', 'other')
+
+# Modules of this package and the subsystem their functions belong to
+PACKAGE_MODULES = {
+    'excel_reader.py': 'I/O',
+    'journal.py': 'I/O',
+    'results_writer.py': 'I/O',
+    'sharding.py': 'I/O',
+    'validation_rules.py': 'validation',
+    'existence_cache.py': 'backend call',
+    'fakes.py': 'backend call',
+    'gui_wait.py': 'backend call',
+    'retry_policy.py': 'backend call',
+    'rfc_connection.py': 'backend call',
+    'rfc_pool.py': 'backend call'
+}
+
+# Functions of the main module by name prefix; the rest (the processing
+# loop and its helpers) count as 'other'
+MAIN_MODULE_FUNCTIONS = (
+    ('validat', 'validation'),
+    ('missing_mask', 'validation'),
+    ('log_progress', 'logging'),
+    ('setup_logging', 'logging'),
+    ('read_input', 'I/O'),
+    ('iter_input', 'I/O'),
+    ('iter_parquet', 'I/O'),
+    ('apply_schema', 'I/O'),
+    ('record_result', 'I/O'),
+    ('open_results', 'I/O'),
+    ('close_run', 'I/O'),
+    ('write_metrics', 'I/O'),
+    ('call_rfc', 'backend call'),
+    ('connect_', 'backend call'),
+    ('open_gui', 'backend call'),
+    ('attach_gui', 'backend call'),
+    ('create_material', 'backend call'),
+    ('update_material', 'backend call'),
+    ('post_materials_batch', 'backend call'),
+    ('assign_material', 'backend call'),
+    ('find_existing', 'backend call'),
+    ('read_existing', 'backend call'),
+    ('fetch_material', 'backend call')
+)
+
+# Library and standard library code by path fragment
+LIBRARY_PATHS = (
+    ('/logging/', 'logging'),
+    ('/openpyxl/', 'I/O'),
+    ('/sqlite3/', 'I/O'),
+    ('/json/', 'I/O'),
+    ('/csv.py', 'I/O'),
+    ('/codecs.py', 'I/O'),
+    ('/zipfile', 'I/O'),
+    ('/pyrfc/', 'backend call'),
+    ('/win32com/', 'backend call'),
+    ('/socket.py', 'backend call'),
+    ('/ssl.py', 'backend call')
+)
+
+# Built-in functions by name fragment
+BUILTIN_NAMES = (
+    ('sqlite3.', 'I/O'),
+    ('_csv.', 'I/O'),
+    ('_io.', 'I/O'),
+    ('io.open', 'I/O'),
+    ('posix.', 'I/O'),
+    ('nt.', 'I/O'),
+    ('zlib.', 'I/O'),
+    ('_socket.', 'backend call'),
+    ('_ssl.', 'backend call'),
+    ('pywintypes', 'backend call'),
+    ("'acquire' of '_thread.", 'waiting'),
+    ("'get' of '_queue.", 'waiting')
+)
+
+
+def classify(function: FunctionKey) -> Optional[str]:
+    """
+    Find the subsystem of a profiled function
+
+    Args:
+        function: pstats key of the function
+
+    Returns:
+        Subsystem name, or None for shared code (pandas, numpy, pyarrow,
+        builtins such as locks) whose time belongs to whoever called it
+    """
+    file_name, _, name = function
+    if file_name == '~':
+        for fragment, subsystem in BUILTIN_NAMES:
+            if fragment in name:
+                return subsystem
+        return None
+
+    path = file_name.replace('\\', '/')
+    base_name = os.path.basename(path)
+    if base_name == 'material_master.py':
+        bare_name = name.lstrip('_')
+        for prefix, subsystem in MAIN_MODULE_FUNCTIONS:
+            if bare_name.startswith(prefix):
+                return subsystem
+        return 'other'
+    if base_name in PACKAGE_MODULES and '/site-packages/' not in path:
+        return PACKAGE_MODULES[base_name]
+    for fragment, subsystem in LIBRARY_PATHS:
+        if fragment in path:
+            return subsystem
+    return None
+
+
+def label(function: FunctionKey) -> str:
+    """Readable name of a profiled function"""
+    file_name, line, name = function
+    if file_name == '~':
+        return name
+    return f"{name} ({os.path.basename(file_name)}:{line})"
+
+
+class RunProfiler:
+    """Run a callable under cProfile and summarize where the time went"""
+
+    def __init__(self):
+        """Create an idle profiler"""
+        self.profiler = cProfile.Profile()
+        self.stats: Optional[pstats.Stats] = None
+        self.threads = 0
+        self._shares: Dict[FunctionKey, Dict[str, float]] = {}
+
+    def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call func under the profiler
+
+        Threads started while func runs (RFC pool and GUI session workers,
+        the --async pipeline) get a profiler of their own, merged into the
+        statistics at the end. Worker processes are not profiled.
+
+        Args:
+            func: Callable to profile
+            args: Positional arguments for func
+            kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        thread_profilers: List[cProfile.Profile] = []
+        lock = threading.Lock()
+
+        def start_thread_profiler(frame: Any, event: str, arg: Any):
+            # Runs on the first call in a new thread and hands over to cProfile
+            sys.setprofile(None)
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: profiling is process-wide, and the run's
+                # profiler already sees this thread
+                return
+            with lock:
+                thread_profilers.append(profiler)
+
+        threading.setprofile(start_thread_profiler)
+        try:
+            return self.profiler.runcall(func, *args, **kwargs)
+        finally:
+            threading.setprofile(None)
+            self.stats = pstats.Stats(self.profiler)
+            with lock:
+                for profiler in thread_profilers:
+                    self.stats.add(profiler)
+                self.threads = 1 + len(thread_profilers)
+            self._shares = {}
+
+    def write(self, prefix: str) -> Tuple[str, str]:
+        """
+        Write the profile
+
+        Args:
+            prefix: Output path without extension
+
+        Returns:
+            Paths of the <prefix>.pstats file (for pstats, snakeviz and
+            similar viewers) and the <prefix>.collapsed file (one
+            "frame;frame;... microseconds" line per stack, for flamegraph.pl
+            or speedscope)
+        """
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        stats_file = f"{prefix}.pstats"
+        self.stats.dump_stats(stats_file)
+
+        collapsed_file = f"{prefix}.collapsed"
+        with open(collapsed_file, 'w', encoding='utf-8') as f:
+            for stack, seconds in sorted(self.collapsed_stacks().items()):
+                microseconds = round(seconds * 1e6)
+                if microseconds:
+                    f.write(f"{stack} {microseconds}\n")
+        return stats_file, collapsed_file
+
+    def collapsed_stacks(self, min_share: float = 0.0001, max_depth: int = 100) -> Dict[str, float]:
+        """
+        Rebuild call stacks with their self time from the profile
+
+        cProfile keeps caller/callee pairs rather than whole stacks, so a
+        function reached along several paths has its time split between
+        them in proportion to the time each caller spent in it.
+
+        Args:
+            min_share: Leave out paths below this share of the total time
+            max_depth: Deepest stack written
+
+        Returns:
+            Seconds of self time by semicolon-joined stack
+        """
+        entries = self.stats.stats
+        callees: Dict[FunctionKey, Dict[FunctionKey, float]] = defaultdict(dict)
+        for function, (_, _, _, _, callers) in entries.items():
+            for caller, (_, _, _, edge_cumulative) in callers.items():
+                callees[caller][function] = edge_cumulative
+
+        min_seconds = self.stats.total_tt * min_share
+        stacks: Dict[str, float] = defaultdict(float)
+
+        def walk(function: FunctionKey, seconds: float, frames: List[str], on_path: set):
+            _, _, own, cumulative, _ = entries[function]
+            share = seconds / cumulative if cumulative else 0.0
+            frames.append(label(function).replace(';', ','))
+            on_path.add(function)
+            stacks[';'.join(frames)] += own * share
+            if len(frames) < max_depth:
+                for callee, edge_cumulative in callees[function].items():
+                    if callee not in on_path and edge_cumulative * share >= min_seconds:
+                        walk(callee, edge_cumulative * share, frames, on_path)
+            on_path.discard(function)
+            frames.pop()
+
+        for function, (_, _, _, cumulative, callers) in entries.items():
+            if not callers:
+                walk(function, cumulative, [], set())
+        return dict(stacks)
+
+    def _subsystem_shares(self, function: FunctionKey, visiting: set) -> Dict[str, float]:
+        # Shared code is split between the subsystems of its callers by the
+        # time each caller spent in it
+        if function in self._shares:
+            return self._shares[function]
+        subsystem = classify(function)
+        if subsystem:
+            shares = {subsystem: 1.0}
+        else:
+            visiting.add(function)
+            shares = defaultdict(float)
+            callers = self.stats.stats[function][4]
+            weight = sum(edge[3] for caller, edge in callers.items() if caller not in visiting)
+            for caller, edge in callers.items():
+                if caller in visiting or not weight:
+                    continue
+                for name, share in self._subsystem_shares(caller, visiting).items():
+                    shares[name] += share * edge[3] / weight
+            visiting.discard(function)
+            shares = dict(shares) or {'other': 1.0}
+        self._shares[function] = shares
+        return shares
+
+    def subsystems(self, limit: int = 5) -> Dict[str, Dict]:
+        """
+        Group the profile's self time by subsystem
+
+        Args:
+            limit: Hot functions listed per subsystem
+
+        Returns:
+            Dictionary by subsystem, slowest first, with seconds and
+            functions (label, seconds, calls) sorted by seconds
+        """
+        groups = {name: {'seconds': 0.0, 'functions': []} for name in SUBSYSTEMS}
+        for function, (_, calls, own, _, _) in self.stats.stats.items():
+            for name, share in self._subsystem_shares(function, set()).items():
+                groups[name]['seconds'] += own * share
+                groups[name]['functions'].append((label(function), own * share, calls))
+
+        for group in groups.values():
+            group['functions'] = sorted(group['functions'], key=lambda entry: -entry[1])[:limit]
+        return dict(sorted(groups.items(), key=lambda item: -item[1]['seconds']))
+
+    def report(self, limit: int = 5) -> str:
+        """
+        Format the hottest functions per subsystem
+
+        Args:
+            limit: Functions listed per subsystem
+
+        Returns:
+            Multi-line text for the console
+        """
+        total = self.stats.total_tt or 1.0
+        lines = [
+            f"Profiled {self.stats.total_tt:.3f}s in {self.stats.total_calls} function calls "
+            f"on {self.threads} thread(s)"
+        ]
+        for name, group in self.subsystems(limit).items():
+            if group['seconds'] < 0.0005:
+                continue
+            lines.append(f"{name:<14}{group['seconds']:9.3f}s {group['seconds'] / total:6.1%}")
+            for function, seconds, calls in group['functions']:
+                if seconds < 0.0005:
+                    break
+                lines.append(f"    {seconds:9.3f}s {calls:>9} calls  {function}")
+        return '\n'.join(lines)
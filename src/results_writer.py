@@ -0,0 +1,137 @@
+"""
+Incremental writer for per-record processing results
+"""
+
+import csv
+import json
+import os
+import time
+from typing import Dict
+
+
+class ResultsWriter:
+    """Append result rows to a CSV, JSONL or Parquet file as records complete"""
+
+    FIELDS = ['record', 'status', 'message', 'data']
+
+    # Rows per Parquet row group; a Parquet file is only readable once closed,
+    # so rows are buffered in large groups instead of flushed periodically
+    PARQUET_ROW_GROUP = 50000
+
+    def __init__(
+        self,
+        output_file: str,
+        include_data: bool = True,
+        flush_every: int = 100,
+        flush_interval: float = 5.0
+    ):
+        """
+        Open the results file
+
+        Args:
+            output_file: Path ending in .csv, .jsonl or .parquet (needs
+                pyarrow; the input row is stored as a JSON string)
+            include_data: Whether to write the echoed input row of each record
+            flush_every: Flush after this many rows
+            flush_interval: Flush at least this often, in seconds
+        """
+        if not output_file.endswith(('.csv', '.jsonl', '.parquet')):
+            raise ValueError(f"Unsupported results format: {output_file}")
+
+        directory = os.path.dirname(output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.output_file = output_file
+        self.include_data = include_data
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._csv = None
+        self._file = None
+        self._parquet = None
+        self._parquet_rows = None
+
+        if output_file.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            fields = self.FIELDS if include_data else self.FIELDS[:-1]
+            types = {'record': pa.int64(), 'status': pa.string(), 'message': pa.string(), 'data': pa.string()}
+            self._schema = pa.schema([(field, types[field]) for field in fields])
+            self._parquet = pq.ParquetWriter(output_file, self._schema)
+            self._parquet_rows = []
+            return
+
+        self._file = open(output_file, 'w', newline='', encoding='utf-8')
+        if output_file.endswith('.csv'):
+            fields = self.FIELDS if include_data else self.FIELDS[:-1]
+            self._csv = csv.DictWriter(self._file, fieldnames=fields, extrasaction='ignore')
+            self._csv.writeheader()
+
+    @staticmethod
+    def _json_data(data: Dict) -> Dict:
+        """Replace NaN values, which JSON cannot represent, with None"""
+        return {
+            key: None if isinstance(value, float) and value != value else value
+            for key, value in (data or {}).items()
+        }
+
+    def write(self, result: Dict):
+        """
+        Append one result row
+
+        Args:
+            result: Result dictionary with record, status, message and data
+        """
+        row = {field: result.get(field) for field in self.FIELDS}
+        if not self.include_data:
+            del row['data']
+
+        if self._parquet:
+            if 'data' in row:
+                row['data'] = json.dumps(self._json_data(row['data']), default=str)
+            self._parquet_rows.append(row)
+            self.written += 1
+            if len(self._parquet_rows) >= self.PARQUET_ROW_GROUP:
+                self._write_row_group()
+            return
+
+        if self._csv:
+            self._csv.writerow(row)
+        else:
+            if 'data' in row:
+                row['data'] = self._json_data(row['data'])
+            self._file.write(json.dumps(row, default=str) + '\n')
+
+        self.written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _write_row_group(self):
+        """Write the buffered Parquet rows as one row group"""
+        import pyarrow as pa
+
+        if self._parquet_rows:
+            self._parquet.write_table(pa.Table.from_pylist(self._parquet_rows, schema=self._schema))
+            self._parquet_rows = []
+
+    def flush(self):
+        """Flush buffered rows to disk (Parquet rows are written in row groups)"""
+        if self._file:
+            self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush and close the results file"""
+        if self._parquet:
+            self._write_row_group()
+            self._parquet.close()
+            self._parquet = None
+        elif self._file and not self._file.closed:
+            self.flush()
+            self._file.close()
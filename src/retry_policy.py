@@ -0,0 +1,180 @@
+"""
+Retry policy with exponential backoff and a circuit breaker for SAP calls
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+# pyrfc errors raised when SAP could not be reached or ran short of
+# resources; matched by name so that pyrfc need not be installed
+TRANSIENT_ERROR_NAMES = {'CommunicationError'}
+TRANSIENT_ERROR_KEYS = {'RFC_COMMUNICATION_FAILURE', 'RFC_RESOURCE_FAILURE', 'RFC_TIMEOUT', 'RFC_CLOSED'}
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Classify an error raised by a remote call
+
+    Communication failures, timeouts and resource shortages are transient
+    and worth retrying. Everything else (ABAP exceptions, logon and
+    parameter errors) is a business error that a retry would only repeat.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        True if the call may succeed when repeated
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(error).__mro__):
+        return True
+    return getattr(error, 'key', None) in TRANSIENT_ERROR_KEYS
+
+
+class CircuitBreaker:
+    """Pause every caller after repeated transient failures"""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        """
+        Create a closed breaker
+
+        Args:
+            threshold: Consecutive transient failures, counted across all
+                callers, that open the breaker (0 disables it)
+            cooldown: Seconds the breaker stays open
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.opened = 0
+        self.paused_seconds = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block while the breaker is open"""
+        while True:
+            with self._lock:
+                remaining = self._open_until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    def record_success(self):
+        """Close the breaker after a call that reached SAP"""
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        """Count a transient failure, opening the breaker at the threshold"""
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self._failures += 1
+            now = time.monotonic()
+            if self._failures >= self.threshold and now >= self._open_until:
+                self._open_until = now + self.cooldown
+                self.opened += 1
+                self.paused_seconds += self.cooldown
+                # Half-open afterwards: one more failure opens it again
+                self._failures = self.threshold - 1
+
+
+class RetryPolicy:
+    """Repeat calls that fail with transient errors, backing off exponentially"""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Create a retry policy
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            base_delay: Upper bound of the first backoff in seconds
+            max_delay: Upper bound of any backoff in seconds
+            breaker: Circuit breaker shared by all callers, if any
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retry number attempt + 1, with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Call func, retrying transient failures
+
+        Args:
+            func: Callable to run
+            args: Positional arguments for func
+            on_retry: Called with (retry number, error, delay) before each retry
+            kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            Exception: The business error, or the last transient error once
+                retries are exhausted
+        """
+        attempt = 0
+        while True:
+            if self.breaker:
+                self.breaker.wait()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                transient = is_transient(e)
+                if self.breaker:
+                    # A business error means SAP answered, so it is not down
+                    if transient:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                if not transient or attempt >= self.max_retries:
+                    raise
+                delay = self.delay(attempt)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                if on_retry:
+                    on_retry(attempt, e, delay)
+                time.sleep(delay)
+                continue
+            if self.breaker:
+                self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict:
+        """
+        Get retry statistics
+
+        Returns:
+            Dictionary with retries, breaker_opened and paused_seconds (time
+            the breaker was open)
+        """
+        breaker = self.breaker
+        return {
+            'retries': self.retries,
+            'breaker_opened': breaker.opened if breaker else 0,
+            'paused_seconds': round(breaker.paused_seconds, 3) if breaker else 0.0
+        }
@@ -0,0 +1,129 @@
+"""
+Self-healing RFC connection that reopens itself after the link to SAP drops
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .retry_policy import is_transient
+except ImportError:
+    from retry_policy import is_transient
+
+
+class ReconnectingConnection:
+    """Wrap an RFC connection, probing it when idle and reopening it when broken"""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        ping_after: float = 60.0,
+        on_reconnect: Optional[Callable[[str], None]] = None,
+        name: str = 'RFC connection'
+    ):
+        """
+        Open the connection
+
+        Args:
+            factory: Callable returning a new, open RFC connection
+            ping_after: Seconds without calls after which the connection is
+                checked with RFC_PING before the next call (0 disables)
+            on_reconnect: Called with the reason whenever the connection
+                is reopened
+            name: Label of the connection in traces
+        """
+        self.name = name
+        self.factory = factory
+        self.ping_after = ping_after
+        self.on_reconnect = on_reconnect
+        self.reconnects = 0
+        self.pings = 0
+        self._lock = threading.Lock()
+        self._lost_reason = 'connection lost'
+        self._connection = factory()
+        self._last_used = time.monotonic()
+
+    def call(self, func_name: str, **params: Any) -> Dict:
+        """
+        Call a remote function on a live connection
+
+        A connection that failed with a transient error is reopened before
+        the call, and one idle for longer than ping_after is probed first.
+        If the link drops during the call, the broken connection is closed
+        and the error raised without sending the call again: the caller's
+        retry policy and circuit breaker decide whether to resend it, and
+        the next call reopens the connection.
+
+        Args:
+            func_name: Name of the remote function
+            params: Function parameters
+
+        Returns:
+            Result dictionary of the call
+        """
+        with self._lock:
+            if self._connection is None:
+                self._reopen(self._lost_reason)
+            elif self.ping_after and time.monotonic() - self._last_used > self.ping_after:
+                self._probe()
+            return self._send(func_name, params)
+
+    def ping(self) -> bool:
+        """
+        Check the connection with RFC_PING, reopening it if the check fails
+
+        Returns:
+            True if the connection is alive (possibly after reopening)
+        """
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._reopen(self._lost_reason)
+                else:
+                    self._probe()
+                return True
+            except Exception:
+                return False
+
+    def _send(self, func_name: str, params: Dict) -> Dict:
+        try:
+            result = self._connection.call(func_name, **params)
+        except Exception as e:
+            if is_transient(e):
+                self._drop(f"{func_name} failed: {str(e)}")
+            raise
+        self._last_used = time.monotonic()
+        return result
+
+    def _probe(self):
+        self.pings += 1
+        try:
+            self._connection.call('RFC_PING')
+            self._last_used = time.monotonic()
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            self._drop()
+            self._reopen(f"RFC_PING failed: {str(e)}")
+
+    def _reopen(self, reason: str):
+        self._connection = self.factory()
+        self._last_used = time.monotonic()
+        self.reconnects += 1
+        if self.on_reconnect:
+            self.on_reconnect(reason)
+
+    def _drop(self, reason: str = 'connection lost'):
+        self._lost_reason = reason
+        connection, self._connection = self._connection, None
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close the connection"""
+        with self._lock:
+            if self._connection is not None:
+                self._drop()
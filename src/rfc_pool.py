@@ -0,0 +1,107 @@
+"""
+RFC connection pool for parallel BAPI calls
+"""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+
+class RFCConnectionPool:
+    """Fixed-size pool of RFC connections shared by worker threads"""
+
+    def __init__(self, factory: Callable[[], Any], size: int):
+        """
+        Open the pool
+
+        Args:
+            factory: Callable returning a new, open RFC connection
+            size: Number of connections to open
+        """
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1: {size}")
+
+        self.size = size
+        self._connections = []
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = []
+        self._started = time.perf_counter()
+
+        try:
+            for slot in range(size):
+                self._connections.append(factory())
+                self._idle.put(slot)
+        except Exception:
+            self.close()
+            raise
+        self.reset_stats()
+
+    @contextmanager
+    def connection(self, records: int = 0) -> Iterator[Any]:
+        """
+        Borrow a connection for the duration of a with-block
+
+        Blocks until a connection is idle. Time spent inside the block is
+        counted towards the connection's busy time.
+
+        Args:
+            records: Number of materials posted during the borrow (0 for
+                lookups such as existence checks)
+
+        Yields:
+            An open RFC connection
+        """
+        slot = self._idle.get()
+        started = time.perf_counter()
+        try:
+            yield self._connections[slot]
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                entry = self._stats[slot]
+                entry['borrows'] += 1
+                entry['records'] += records
+                entry['busy_seconds'] += elapsed
+            self._idle.put(slot)
+
+    def reset_stats(self):
+        """Zero the statistics and restart their clock, e.g. when a run starts"""
+        with self._lock:
+            self._started = time.perf_counter()
+            self._stats = [
+                {'connection': slot, 'borrows': 0, 'records': 0, 'busy_seconds': 0.0}
+                for slot in range(self.size)
+            ]
+
+    def stats(self) -> List[Dict]:
+        """
+        Get per-connection throughput statistics since the pool opened or
+        the statistics were last reset
+
+        Returns:
+            One dictionary per connection with borrows (all uses, lookups
+            included), records (materials posted), busy_seconds,
+            records_per_second (records over the elapsed wall-clock time)
+            and utilization (share of the elapsed time the connection was
+            borrowed)
+        """
+        with self._lock:
+            stats = [dict(entry) for entry in self._stats]
+            elapsed = time.perf_counter() - self._started
+
+        for entry in stats:
+            entry['records_per_second'] = entry['records'] / elapsed if elapsed else 0.0
+            entry['utilization'] = entry['busy_seconds'] / elapsed if elapsed else 0.0
+        return stats
+
+    def close(self):
+        """Close all connections in the pool"""
+        for connection in self._connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._connections = []
@@ -0,0 +1,85 @@
+"""
+Split CSV input files into byte ranges that worker processes parse independently
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def csv_is_shardable(file_path: str, block_size: int = 1 << 20) -> bool:
+    """
+    Check whether a CSV file can be split at line boundaries
+
+    Quoted fields may contain line breaks, so files with any quote
+    character are not split by bytes.
+
+    Args:
+        file_path: Path to the CSV file
+        block_size: Bytes to scan at a time
+
+    Returns:
+        True if every line break ends a record
+    """
+    with open(file_path, 'rb') as f:
+        while block := f.read(block_size):
+            if b'"' in block:
+                return False
+    return True
+
+
+def csv_byte_ranges(file_path: str, count: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Split a CSV file into about count byte ranges of whole lines
+
+    Args:
+        file_path: Path to the CSV file
+        count: Desired number of ranges
+
+    Returns:
+        Tuple of (header, ranges) where header is the raw header line and
+        ranges are (start, end) byte offsets covering all data lines in order
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        header = f.readline()
+        bounds = [f.tell()]
+        for part in range(1, count):
+            # Move each cut forward to the start of the next line
+            f.seek(bounds[0] + (size - bounds[0]) * part // count)
+            f.readline()
+            position = f.tell()
+            if position >= size:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+        bounds.append(size)
+
+    return header, [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def read_csv_range(file_path: str, header: bytes, start: int, end: int, **read_options: Any) -> pd.DataFrame:
+    """
+    Parse one byte range of a CSV file
+
+    Args:
+        file_path: Path to the CSV file
+        header: Raw header line of the file
+        start: Offset of the first byte of the range
+        end: Offset just past the last byte of the range
+        **read_options: Further pandas.read_csv arguments (e.g. dtype)
+
+    Returns:
+        DataFrame with the records of the range, indexed from 0
+    """
+    import pandas as pd
+
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data), **read_options)
@@ -0,0 +1,86 @@
+"""
+Timeline of a processing run in Chrome trace event format, viewable in
+chrome://tracing, Perfetto or speedscope
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TraceRecorder:
+    """Collect timed spans per thread or connection and write them as a trace file"""
+
+    def __init__(self):
+        """Start an empty trace; span times are relative to now"""
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self._tracks: Dict[str, int] = {}
+        self._spans: List[Tuple[str, int, float, float, Optional[Dict]]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float, track: Optional[str] = None, **args: Any):
+        """
+        Record a span that ends now
+
+        Args:
+            name: Stage name, e.g. 'post' or 'rfc_call'
+            seconds: Duration of the span
+            track: Timeline row, e.g. 'RFC connection 0' (default: the
+                name of the current thread)
+            args: Details shown for the span, e.g. record=12
+        """
+        ended = time.perf_counter()
+        if track is None:
+            track = threading.current_thread().name
+        with self._lock:
+            track_id = self._tracks.get(track)
+            if track_id is None:
+                track_id = self._tracks[track] = len(self._tracks) + 1
+            self._spans.append((name, track_id, ended - seconds - self.origin, seconds, args or None))
+
+    def events(self) -> List[Dict]:
+        """
+        Build the trace events
+
+        Returns:
+            thread_name metadata events naming each track, followed by one
+            complete ('X') event per span with times in microseconds
+        """
+        with self._lock:
+            tracks = dict(self._tracks)
+            spans = list(self._spans)
+
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': track_id, 'args': {'name': track}}
+            for track, track_id in tracks.items()
+        ]
+        for name, track_id, started, seconds, args in spans:
+            event = {
+                'name': name,
+                'cat': 'stage',
+                'ph': 'X',
+                'ts': round(started * 1e6, 1),
+                'dur': round(seconds * 1e6, 1),
+                'pid': self.pid,
+                'tid': track_id
+            }
+            if args:
+                event['args'] = args
+            events.append(event)
+        return events
+
+    def write(self, path: str):
+        """
+        Write the trace as a JSON file
+
+        Args:
+            path: Output file, e.g. trace.json
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events(), 'displayTimeUnit': 'ms'}, f, default=str)
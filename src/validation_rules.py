@@ -0,0 +1,271 @@
+"""
+Declarative column validation rules, compiled once and shared by the
+per-record and column-wise validators
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Tuple, Union
+
+if TYPE_CHECKING:
+    import configparser
+
+    import numpy as np
+    import pandas as pd
+
+
+def column_text(column: pd.Series) -> np.ndarray:
+    """
+    Convert a column to an array of strings exactly as str() would per value
+
+    Args:
+        column: Column to convert
+
+    Returns:
+        NumPy unicode array aligned to the column
+    """
+    return column.to_numpy(dtype=object).astype(str)
+
+
+def _is_true(value: str) -> bool:
+    return str(value).strip().lower() in ('1', 'yes', 'true', 'on')
+
+
+def _is_missing(value: Any) -> bool:
+    try:
+        return value is None or bool(value != value)
+    except TypeError:  # pd.NA
+        return True
+
+
+class ColumnRule:
+    """Validation rule for one input column, compiled from its settings"""
+
+    OPTIONS = {
+        'type', 'label', 'case', 'strip', 'skip_missing', 'enabled',
+        'allowed', 'min_length', 'max_length', 'pattern', 'min', 'max',
+        'allowed_message', 'min_length_message', 'max_length_message',
+        'pattern_message', 'number_message', 'min_message', 'max_message'
+    }
+
+    MESSAGES = {
+        'allowed_message': "Invalid {label}: {value}",
+        'min_length_message': "{label} too short: {value}",
+        'max_length_message': "{label} too long: {value}",
+        'pattern_message': "Invalid {label} format: {value}",
+        'number_message': "Invalid {label} value: {value}",
+        'min_message': "{label} must be at least {min}",
+        'max_message': "{label} must be at most {max}"
+    }
+
+    def __init__(self, column: str, settings: Mapping[str, str]):
+        """
+        Compile a rule
+
+        Args:
+            column: Input column the rule applies to
+            settings: Rule options as strings, e.g. from a [Rule:<column>]
+                config section (see config_template.ini)
+
+        Raises:
+            ValueError: If an option is unknown or invalid
+        """
+        unknown = set(settings) - self.OPTIONS
+        if unknown:
+            raise ValueError(f"Unknown option(s) for rule {column}: {', '.join(sorted(unknown))}")
+
+        self.column = column
+        self.type = settings.get('type', 'text').strip().lower()
+        if self.type not in ('text', 'number'):
+            raise ValueError(f"Invalid type for rule {column}: {self.type}")
+        self.label = settings.get('label', column.replace('_', ' '))
+        self.enabled = _is_true(settings.get('enabled', 'true'))
+
+        self.case = settings.get('case', 'none').strip().lower()
+        if self.case not in ('none', 'upper', 'lower'):
+            raise ValueError(f"Invalid case for rule {column}: {self.case}")
+        self.strip = _is_true(settings.get('strip', 'false'))
+        self.skip_missing = _is_true(settings.get('skip_missing', 'true'))
+
+        allowed = [value.strip() for value in settings.get('allowed', '').split(',') if value.strip()]
+        self.allowed = frozenset(self._normalize(value) for value in allowed) if allowed else None
+        self.min_length = int(settings['min_length']) if settings.get('min_length') else None
+        self.max_length = int(settings['max_length']) if settings.get('max_length') else None
+        self.pattern = re.compile(settings['pattern']) if settings.get('pattern') else None
+        self.min = float(settings['min']) if settings.get('min') else None
+        self.max = float(settings['max']) if settings.get('max') else None
+
+        self.messages = {key: settings.get(key, default) for key, default in self.MESSAGES.items()}
+        self._limits = {'min': settings.get('min', '').strip(), 'max': settings.get('max', '').strip()}
+
+    def _normalize(self, text: str) -> str:
+        if self.strip:
+            text = text.strip()
+        if self.case == 'upper':
+            return text.upper()
+        if self.case == 'lower':
+            return text.lower()
+        return text
+
+    def _message(self, check: str, value: Any) -> str:
+        return self.messages[f'{check}_message'].format(label=self.label, value=value, **self._limits)
+
+    def check_value(self, value: Any) -> List[str]:
+        """
+        Validate a single value
+
+        Args:
+            value: Value of the column in one record
+
+        Returns:
+            List of error messages (empty if valid)
+        """
+        if self.type == 'number':
+            return self._check_number(value)
+
+        if self.skip_missing and _is_missing(value):
+            return []
+        text = self._normalize(str(value))
+        if not text:
+            return []
+
+        errors = []
+        if self.allowed is not None and text not in self.allowed:
+            errors.append(self._message('allowed', text))
+        if self.min_length is not None and len(text) < self.min_length:
+            errors.append(self._message('min_length', text))
+        if self.max_length is not None and len(text) > self.max_length:
+            errors.append(self._message('max_length', text))
+        if self.pattern is not None and not self.pattern.fullmatch(text):
+            errors.append(self._message('pattern', text))
+        return errors
+
+    def _check_number(self, value: Any) -> List[str]:
+        # Falsy values (None, '', 0) are not checked; NaN passes every comparison
+        if not value:
+            return []
+        try:
+            number = float(value)
+        except (ValueError, TypeError):
+            return [self._message('number', value)]
+
+        errors = []
+        if self.min is not None and number < self.min:
+            errors.append(self._message('min', value))
+        if self.max is not None and number > self.max:
+            errors.append(self._message('max', value))
+        return errors
+
+    def check_column(self, column: pd.Series) -> List[Tuple[np.ndarray, Union[str, np.ndarray]]]:
+        """
+        Validate a whole column with the same outcome as check_value per value
+
+        Args:
+            column: Column to validate
+
+        Returns:
+            List of (error_mask, messages) pairs in check order, where
+            messages is an object array holding the text for flagged rows
+        """
+        if self.type == 'number':
+            return self._check_number_column(column)
+
+        import numpy as np
+        import pandas as pd
+
+        text = column_text(column)
+        if self.strip:
+            text = np.char.strip(text)
+        if self.case == 'upper':
+            text = np.char.upper(text)
+        elif self.case == 'lower':
+            text = np.char.lower(text)
+        candidates = np.char.str_len(text) > 0
+        if self.skip_missing:
+            candidates &= column.notna().to_numpy()
+
+        checks = []
+        if self.allowed is not None:
+            checks.append(('allowed', candidates & ~pd.Series(text).isin(self.allowed).to_numpy()))
+        if self.min_length is not None:
+            checks.append(('min_length', candidates & (np.char.str_len(text) < self.min_length)))
+        if self.max_length is not None:
+            checks.append(('max_length', candidates & (np.char.str_len(text) > self.max_length)))
+        if self.pattern is not None:
+            matches = np.array([bool(self.pattern.fullmatch(value)) for value in text], dtype=bool)
+            checks.append(('pattern', candidates & ~matches))
+
+        results = []
+        for check, mask in checks:
+            messages = np.empty(len(text), dtype=object)
+            messages[mask] = [self._message(check, value) for value in text[mask]]
+            results.append((mask, messages))
+        return results
+
+    def _check_number_column(self, column: pd.Series) -> List[Tuple[np.ndarray, np.ndarray]]:
+        import numpy as np
+        import pandas as pd
+
+        length = len(column)
+        error_mask = np.zeros(length, dtype=bool)
+        messages = np.empty(length, dtype=object)
+
+        def check_range(positions: np.ndarray, numbers: np.ndarray, raw: np.ndarray):
+            for check, bound, failing in (('min', self.min, numbers < (self.min or 0)),
+                                          ('max', self.max, numbers > (self.max or 0))):
+                if bound is None:
+                    continue
+                for position in positions[failing]:
+                    error_mask[position] = True
+                    messages[position] = self._message(check, raw[position])
+
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            numbers = column.to_numpy(dtype=float)
+            positions = np.flatnonzero(numbers != 0)
+            check_range(positions, numbers[positions], column.to_numpy(dtype=object))
+            return [(error_mask, messages)]
+
+        # None, NaN, '' and 0 are falsy and skipped by the per-value check
+        values = column.to_numpy(dtype=object)
+        candidates = column.notna().to_numpy() & (values != '') & (values != 0)
+        positions = np.flatnonzero(candidates)
+        numbers = pd.to_numeric(column[candidates], errors='coerce').to_numpy(dtype=float, copy=True)
+
+        # Values pandas could not coerce fall back to float() so that the
+        # outcome matches the per-value check exactly (e.g. '1_000', 'nan')
+        for index in np.flatnonzero(np.isnan(numbers)):
+            try:
+                numbers[index] = float(values[positions[index]])
+            except (ValueError, TypeError):
+                error_mask[positions[index]] = True
+                messages[positions[index]] = self._message('number', values[positions[index]])
+
+        check_range(positions, numbers, values)
+        return [(error_mask, messages)]
+
+
+def load_rules(defaults: Mapping[str, Mapping[str, str]], config: configparser.ConfigParser) -> List[ColumnRule]:
+    """
+    Compile the validation rule table
+
+    Built-in rules are overridden option by option by [Rule:<column>]
+    sections of the configuration; sections for other columns add rules.
+
+    Args:
+        defaults: Built-in rule settings by column, in check order
+        config: Tool configuration
+
+    Returns:
+        Enabled rules in check order
+    """
+    settings: Dict[str, Dict[str, str]] = {column: dict(options) for column, options in defaults.items()}
+    for section in config.sections():
+        if section.startswith('Rule:'):
+            column = section[len('Rule:'):].strip()
+            # Only the section's own options: items() would add every [DEFAULT] key
+            options = {key: config.get(section, key, raw=True) for key in config._sections[section]}
+            settings.setdefault(column, {}).update(options)
+
+    rules = [ColumnRule(column, options) for column, options in settings.items()]
+    return [rule for rule in rules if rule.enabled]
@@ -0,0 +1,65 @@
+"""
+Shared fixtures: a MaterialMasterAutomation writing its logs, results and
+journal into a temporary directory
+"""
+
+import configparser
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture
+def make_automation(tmp_path, monkeypatch):
+    """Return a factory creating automations from config overrides"""
+    from material_master import MaterialMasterAutomation
+
+    # Results files are written to logs/ relative to the working directory
+    monkeypatch.chdir(tmp_path)
+
+    def make(settings=None, **kwargs):
+        config = configparser.ConfigParser()
+        config.read_dict({
+            'Logging': {
+                'log_level': 'WARNING',
+                'log_file': str(tmp_path / 'logs' / 'material_master.log'),
+                'queue_logging': 'False'
+            },
+            'Automation': {'journal_file': str(tmp_path / 'logs' / 'journal.sqlite')}
+        })
+        config.read_dict(settings or {})
+        config_file = tmp_path / 'config.ini'
+        with open(config_file, 'w') as f:
+            config.write(f)
+        return MaterialMasterAutomation(str(config_file), **kwargs)
+
+    return make
+
+
+def write_materials(path, count, numbered):
+    """Write count valid material records, numbered 1..count if numbered"""
+    lines = ['Material_Number,Material_Type,Industry_Sector,Description,Base_Unit,Material_Group']
+    lines += [f'{number if numbered else ""},FERT,M,Material {number},EA,1000' for number in range(1, count + 1)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def materials_csv(request, tmp_path):
+    """
+    CSV of valid records without material numbers; parametrize indirectly
+    with the record count (default 20)
+    """
+    return write_materials(tmp_path / 'materials.csv', getattr(request, 'param', 20), numbered=False)
+
+
+@pytest.fixture
+def numbered_csv(request, tmp_path):
+    """
+    CSV of valid records with material numbers 1..count; parametrize
+    indirectly with the record count (default 20)
+    """
+    return write_materials(tmp_path / 'numbered.csv', getattr(request, 'param', 20), numbered=True)
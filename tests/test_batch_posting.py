@@ -0,0 +1,81 @@
+"""
+BAPI_MATERIAL_SAVEREPLICA outcomes are mapped back to records without
+reporting unconfirmed records as saved or posting saved ones twice
+"""
+
+from fakes import CommunicationError, FakeRFCConnection
+
+MATERIALS = [
+    {'Material_Number': number, 'Material_Type': 'FERT', 'Industry_Sector': 'M',
+     'Description': f'Material {number}', 'Base_Unit': 'EA'}
+    for number in ('M1', 'M2', 'M3', 'M4')
+]
+
+
+class ReplicaResult(FakeRFCConnection):
+    """Fake connection answering BAPI_MATERIAL_SAVEREPLICA with a fixed result"""
+
+    def __init__(self, result, **params):
+        super().__init__(**params)
+        self.result = result
+
+    def call(self, func_name, **kwargs):
+        if func_name == 'BAPI_MATERIAL_SAVEREPLICA':
+            self.calls.append({'function': func_name, 'parameters': kwargs})
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result
+        return super().call(func_name, **kwargs)
+
+
+def saved_singly(connection):
+    """Material numbers posted one by one with BAPI_MATERIAL_SAVEDATA"""
+    return [call['parameters']['HEADDATA']['MATERIAL'] for call in connection.calls
+            if call['function'] == 'BAPI_MATERIAL_SAVEDATA']
+
+
+def test_unconfirmed_records_are_posted_singly(make_automation):
+    # M1 saved, M2 rejected, M3 and M4 without a message, plus an error
+    # that belongs to no record and a failed RETURN
+    connection = ReplicaResult({
+        'RETURN': {'TYPE': 'E', 'MESSAGE': 'Batch failed'},
+        'RETURNMESSAGES': [
+            {'TYPE': 'S', 'MATERIAL': 'M1', 'MESSAGE': 'Material M1 saved'},
+            {'TYPE': 'E', 'MATERIAL': 'M2', 'MESSAGE': 'Material M2 rejected'},
+            {'TYPE': 'E', 'MESSAGE': 'Plant data incomplete'}
+        ]
+    })
+    automation = make_automation()
+
+    outcomes = automation.post_materials_batch_rfc(MATERIALS, 'create', connection)
+
+    assert outcomes[0] == (True, 'Material M1 created successfully')
+    assert saved_singly(connection) == ['M2', 'M3', 'M4']
+    assert all(success for success, _ in outcomes)
+
+
+def test_error_for_repeated_material_number_applies_to_every_row(make_automation):
+    materials = [MATERIALS[0], dict(MATERIALS[0]), MATERIALS[1]]
+    connection = ReplicaResult({
+        'RETURN': {'TYPE': 'E', 'MESSAGE': 'Batch failed'},
+        'RETURNMESSAGES': [
+            {'TYPE': 'E', 'MATERIAL': 'M1', 'MESSAGE': 'Material M1 locked'},
+            {'TYPE': 'S', 'MATERIAL': 'M2', 'MESSAGE': 'Material M2 saved'}
+        ]
+    })
+    automation = make_automation()
+
+    automation.post_materials_batch_rfc(materials, 'create', connection)
+
+    assert saved_singly(connection) == ['M1', 'M1']
+
+
+def test_lost_batch_call_is_not_posted_again(make_automation):
+    connection = ReplicaResult(CommunicationError('Connection to SAP lost'))
+    automation = make_automation({'Automation': {'max_retries': '0'}})
+
+    outcomes = automation.post_materials_batch_rfc(MATERIALS, 'create', connection)
+
+    assert saved_singly(connection) == []
+    assert not any(success for success, _ in outcomes)
+    assert 'was not posted again' in outcomes[0][1]
@@ -0,0 +1,56 @@
+"""
+Existence checks for existing_materials = skip / update
+"""
+
+import pytest
+
+from fakes import FakeRFCConnection
+
+
+class ReadTableLimit(FakeRFCConnection):
+    """Fake connection rejecting RFC_READ_TABLE statements above a size, like SAP"""
+
+    def __init__(self, max_options=None, **params):
+        super().__init__(**params)
+        self.max_options = max_options
+        self.read_calls = 0
+
+    def call(self, func_name, **kwargs):
+        if func_name == 'RFC_READ_TABLE':
+            self.read_calls += 1
+            if self.max_options is None or len(kwargs.get('OPTIONS', ())) > self.max_options:
+                raise RuntimeError('SAPSQL_STMNT_TOO_LARGE')
+        return super().call(func_name, **kwargs)
+
+
+@pytest.mark.parametrize('numbered_csv', [1200], indirect=True)
+def test_lookup_is_split_into_batches(make_automation, numbered_csv):
+    table = {str(number).zfill(18): {} for number in range(1, 1201, 2)}
+    connection = ReadTableLimit(max_options=502, table=table)
+    automation = make_automation(
+        {'Automation': {'existing_materials': 'skip'}},
+        rfc_connection_factory=lambda **params: connection
+    )
+
+    summary = automation.process_materials(numbered_csv, method='rfc', action='create')
+
+    assert connection.read_calls == 3
+    assert summary['skipped'] == 600
+    assert summary['success'] == 600
+    assert summary['failed'] == 0
+
+
+@pytest.mark.parametrize('numbered_csv', [1200], indirect=True)
+def test_failed_lookup_fails_records_instead_of_creating(make_automation, numbered_csv):
+    connection = ReadTableLimit(max_options=None)
+    automation = make_automation(
+        {'Automation': {'existing_materials': 'skip', 'max_retries': '0'}},
+        rfc_connection_factory=lambda **params: connection
+    )
+
+    summary = automation.process_materials(numbered_csv, method='rfc', action='create')
+
+    assert summary['success'] == 0
+    assert summary['failed'] == 1200
+    assert not any(call['function'] == 'BAPI_MATERIAL_SAVEDATA' for call in connection.calls)
+    assert 'Could not check whether material' in summary['results'][0]['message']
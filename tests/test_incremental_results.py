@@ -0,0 +1,43 @@
+"""
+Results are written while a run is going, not only when it ends
+"""
+
+import glob
+
+import pytest
+
+from fakes import FakeRFCConnection
+
+
+class WatchingConnection(FakeRFCConnection):
+    """Fake connection noting the lines in the results file whenever materials are saved"""
+
+    def __init__(self, seen, **params):
+        super().__init__(latency=0.005, **params)
+        self.seen = seen
+
+    def call(self, func_name, **kwargs):
+        if func_name in ('BAPI_MATERIAL_SAVEDATA', 'BAPI_MATERIAL_SAVEREPLICA'):
+            with open(glob.glob('logs/results_*.csv')[0]) as f:
+                self.seen.append(sum(1 for _ in f))
+        return super().call(func_name, **kwargs)
+
+
+@pytest.mark.parametrize('materials_csv', [40], indirect=True)
+@pytest.mark.parametrize('rfc', [
+    {'pool_size': '1'},
+    {'pool_size': '2'},
+    {'pool_size': '2', 'batch_size': '5'}
+])
+def test_results_file_grows_during_run(make_automation, materials_csv, rfc):
+    seen = []
+    automation = make_automation(
+        {'RFC': rfc, 'Automation': {'results_flush_every': '1'}},
+        rfc_connection_factory=lambda **params: WatchingConnection(seen, **params)
+    )
+
+    summary = automation.process_materials(materials_csv, method='rfc', action='create')
+
+    assert summary['success'] == 40
+    assert seen[0] <= 1
+    assert seen[-1] > 10
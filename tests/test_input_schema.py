@@ -0,0 +1,34 @@
+"""
+Input schema: codes stored as text keep their leading zeros
+"""
+
+import pytest
+
+openpyxl = pytest.importorskip('openpyxl')
+
+
+@pytest.fixture
+def text_code_workbook(tmp_path):
+    """Workbook whose Plant cells are text-formatted codes with leading zeros"""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(['Material_Type', 'Industry_Sector', 'Description', 'Base_Unit', 'Material_Group', 'Plant', 'Price'])
+    sheet.append(['FERT', 'M', 'Widget', 'EA', 1000, '0001', 12.5])
+    sheet.append(['HALB', 'M', 'Gadget', 'PC', '2000', '0002', 3])
+    for row in (2, 3):
+        sheet.cell(row, 6).number_format = '@'
+    path = tmp_path / 'text_codes.xlsx'
+    workbook.save(path)
+    return str(path)
+
+
+def test_excel_text_codes_unchunked_and_chunked(make_automation, text_code_workbook):
+    automation = make_automation()
+
+    df = automation.read_input_file(text_code_workbook)
+    chunks = list(automation.read_input_file(text_code_workbook, chunksize=1))
+
+    assert list(df['Plant']) == ['0001', '0002']
+    assert [chunk['Plant'].iloc[0] for chunk in chunks] == ['0001', '0002']
+    assert list(df['Material_Group']) == ['1000', '2000']
+    assert list(df['Price']) == [12.5, 3.0]
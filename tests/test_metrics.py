@@ -0,0 +1,33 @@
+"""
+Run metrics cover the posting stage however records are posted
+"""
+
+import pytest
+
+from fakes import FakeRFCConnection
+
+
+@pytest.mark.parametrize('rfc, posts', [
+    ({'pool_size': '1'}, 20),
+    ({'pool_size': '1', 'batch_size': '5'}, 4),
+    ({'pool_size': '2', 'batch_size': '5'}, 4)
+])
+def test_post_stage_is_measured(make_automation, materials_csv, rfc, posts):
+    automation = make_automation(
+        {'RFC': rfc},
+        rfc_connection_factory=lambda **params: FakeRFCConnection(**params)
+    )
+
+    summary = automation.process_materials(materials_csv, method='rfc', action='create')
+
+    assert summary['success'] == 20
+    assert summary['metrics']['post']['count'] == posts
+
+
+@pytest.mark.parametrize('chunksize, reads', [(0, 1), (5, 4)])
+def test_each_read_is_measured_once(make_automation, materials_csv, chunksize, reads):
+    automation = make_automation()
+
+    summary = automation.process_materials(materials_csv, action='validate', chunksize=chunksize)
+
+    assert summary['metrics']['read']['count'] == reads
@@ -0,0 +1,32 @@
+"""
+--workers validation: option checks and chunking of files that cannot be
+split into byte ranges
+"""
+
+import sys
+
+import pytest
+
+import material_master
+
+
+@pytest.mark.parametrize('flag', [['--async'], ['--resume'], ['--profile']])
+def test_workers_rejects_options_it_would_ignore(materials_csv, monkeypatch, capsys, flag):
+    monkeypatch.setattr(sys, 'argv', ['material_master.py', materials_csv, '--action', 'validate',
+                                      '--workers', '2', *flag])
+
+    with pytest.raises(SystemExit) as exit_info:
+        material_master.main()
+
+    assert exit_info.value.code == 2
+    assert f'{flag[0]} cannot be combined with --workers' in capsys.readouterr().err
+
+
+def test_shards_of_quoted_csv_use_the_given_chunksize(make_automation, materials_csv):
+    with open(materials_csv, 'a') as f:
+        f.write(',FERT,M,"Material, quoted",EA,1000\n')
+    automation = make_automation({'Automation': {'chunk_size': '100'}})
+
+    shards = list(automation._validation_shards(materials_csv, 2, chunksize=5))
+
+    assert [len(shard) for shard in shards] == [5, 5, 5, 5, 1]
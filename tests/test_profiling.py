@@ -0,0 +1,22 @@
+"""
+--profile covers work done on worker threads
+"""
+
+from fakes import FakeRFCConnection
+from profiling import RunProfiler
+
+
+def test_pooled_run_profiles_worker_threads(make_automation, materials_csv):
+    automation = make_automation(
+        {'RFC': {'pool_size': '2'}},
+        rfc_connection_factory=lambda **params: FakeRFCConnection(**params)
+    )
+    profiler = RunProfiler()
+
+    summary = profiler.run(automation.process_materials, materials_csv, method='rfc', action='create')
+
+    assert summary['success'] == 20
+    assert profiler.threads > 1
+    assert profiler.subsystems()['backend call']['seconds'] > 0
+    functions = {name for _, _, name in profiler.stats.stats}
+    assert 'create_material_rfc' in functions
@@ -0,0 +1,44 @@
+"""
+Calls lost with the connection are resent only under the retry policy
+"""
+
+import pytest
+
+from fakes import CommunicationError, FakeRFCConnection
+
+
+class DroppingConnection(FakeRFCConnection):
+    """Fake connection whose link drops whenever a material is saved"""
+
+    def __init__(self, sends, **params):
+        super().__init__(**params)
+        self.sends = sends
+
+    def call(self, func_name, **kwargs):
+        if func_name == 'BAPI_MATERIAL_SAVEDATA':
+            self.sends.append(func_name)
+            raise CommunicationError('Connection to SAP was closed by the gateway')
+        return super().call(func_name, **kwargs)
+
+
+@pytest.fixture
+def material_csv(tmp_path):
+    """One valid material record"""
+    path = tmp_path / 'material.csv'
+    path.write_text('Material_Type,Industry_Sector,Description,Base_Unit\nFERT,M,Material,EA\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('max_retries', ['0', '2'])
+def test_dropped_call_is_sent_at_most_max_retries_plus_one_times(make_automation, material_csv, max_retries):
+    sends = []
+    automation = make_automation(
+        {'Automation': {'max_retries': max_retries, 'retry_base_delay': '0', 'breaker_threshold': '100'}},
+        rfc_connection_factory=lambda **params: DroppingConnection(sends, **params)
+    )
+
+    summary = automation.process_materials(material_csv, method='rfc', action='create')
+
+    assert summary['failed'] == 1
+    assert len(sends) == int(max_retries) + 1
+    assert summary.get('retries', {}).get('reconnects', 0) == int(max_retries)
@@ -0,0 +1,39 @@
+"""
+Connection pool statistics measure posted materials over the run
+"""
+
+import time
+
+from fakes import FakeRFCConnection
+from rfc_pool import RFCConnectionPool
+
+
+def test_throughput_is_measured_over_wall_clock_time():
+    pool = RFCConnectionPool(FakeRFCConnection, 1)
+    pool.reset_stats()
+    with pool.connection(records=4):
+        time.sleep(0.05)
+    with pool.connection():
+        pass
+    time.sleep(0.05)
+
+    entry = pool.stats()[0]
+
+    assert entry['borrows'] == 2
+    assert entry['records'] == 4
+    # 4 records in ~0.1s of wall-clock time, not in ~0.05s of busy time
+    assert entry['records_per_second'] < 4 / 0.09
+    assert 0.2 < entry['utilization'] < 0.9
+
+
+def test_run_counts_posts_apart_from_lookups(make_automation, numbered_csv):
+    automation = make_automation(
+        {'RFC': {'pool_size': '2'}, 'Automation': {'existing_materials': 'skip'}},
+        rfc_connection_factory=lambda **params: FakeRFCConnection(**params)
+    )
+
+    summary = automation.process_materials(numbered_csv, method='rfc', action='create')
+
+    assert summary['success'] == 20
+    assert sum(entry['records'] for entry in summary['connections']) == 20
+    assert sum(entry['borrows'] for entry in summary['connections']) > 20
@@ -0,0 +1,29 @@
+"""
+A run that stops part way reports why: the input or the processing
+"""
+
+
+def test_unreadable_chunk_is_reported_as_read_error(make_automation, materials_csv):
+    with open(materials_csv, 'a') as f:
+        f.write(',FERT,M,"Broken,EA,1000\n')
+    automation = make_automation()
+
+    summary = automation.process_materials(materials_csv, action='validate', chunksize=5)
+
+    assert summary['status'] == 'error'
+    assert summary['message'].startswith('Failed to read input file:')
+    assert summary['success'] == 20
+
+
+def test_processing_error_is_not_reported_as_read_error(make_automation, materials_csv, monkeypatch):
+    automation = make_automation()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('results disk full')
+
+    monkeypatch.setattr(automation, '_record_result', fail)
+
+    summary = automation.process_materials(materials_csv, action='validate', chunksize=5)
+
+    assert summary['status'] == 'error'
+    assert summary['message'] == 'Processing failed: results disk full'
@@ -0,0 +1,54 @@
+"""
+Posting threads are started once per run, not once per chunk
+"""
+
+import threading
+
+from fakes import FakeRFCConnection, FakeScriptingEngine
+from gui_wait import GuiWaiter
+
+
+class ThreadRecordingConnection(FakeRFCConnection):
+    """Fake connection noting the threads that save materials"""
+
+    def __init__(self, threads, **params):
+        super().__init__(**params)
+        self.threads = threads
+
+    def call(self, func_name, **kwargs):
+        if func_name == 'BAPI_MATERIAL_SAVEDATA':
+            self.threads.add(threading.current_thread())
+        return super().call(func_name, **kwargs)
+
+
+def test_pooled_run_keeps_its_workers_across_chunks(make_automation, materials_csv):
+    threads = set()
+    automation = make_automation(
+        {'RFC': {'pool_size': '2'}},
+        rfc_connection_factory=lambda **params: ThreadRecordingConnection(threads, **params)
+    )
+
+    summary = automation.process_materials(materials_csv, method='rfc', action='create', chunksize=5)
+
+    assert summary['success'] == 20
+    assert len(threads) <= 2
+    assert all(not thread.is_alive() for thread in threads)
+
+
+def test_gui_sessions_are_attached_once_per_run(make_automation, materials_csv):
+    engine = FakeScriptingEngine(response_time=0.0)
+    automation = make_automation({'SAP': {'gui_sessions': '2'}}, gui_engine_factory=lambda: engine)
+    automation.gui_waiter = GuiWaiter(poll_interval=0.0)
+    attached = []
+    attach = automation._attach_gui_session
+
+    def count_attach(slot):
+        attached.append(slot)
+        return attach(slot)
+
+    automation._attach_gui_session = count_attach
+
+    summary = automation.process_materials(materials_csv, method='gui', action='create', chunksize=5)
+
+    assert summary['success'] == 20
+    assert sorted(attached) == [0, 1]
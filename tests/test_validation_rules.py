@@ -0,0 +1,37 @@
+"""
+[Rule:<column>] sections of the configuration
+"""
+
+import configparser
+
+from validation_rules import load_rules
+
+
+def test_default_section_does_not_leak_into_rules():
+    config = configparser.ConfigParser()
+    config.read_string(
+        "[DEFAULT]\n"
+        "log_dir = logs\n"
+        "[Rule:Gross_Weight]\n"
+        "type = number\n"
+        "max = 25000\n"
+    )
+
+    rules = load_rules({}, config)
+
+    assert [rule.column for rule in rules] == ['Gross_Weight']
+
+
+def test_automation_loads_rules_with_default_section(make_automation):
+    automation = make_automation({
+        'DEFAULT': {'base_dir': '.'},
+        'Rule:Material_Group': {'pattern': '[0-9]{4}'}
+    })
+
+    valid, errors = automation.validate_material_data({
+        'Material_Type': 'FERT', 'Industry_Sector': 'M', 'Description': 'Material',
+        'Base_Unit': 'EA', 'Material_Group': 'AB'
+    })
+
+    assert not valid
+    assert any('Material_Group' in error or 'AB' in error for error in errors)